@@ -1,49 +1,141 @@
 """Artifacts API endpoints"""
 
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from uuid import uuid4
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy import bindparam, select
+from sqlalchemy.orm import Session, selectinload
+from starlette.types import Receive, Scope, Send
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Union
+from urllib.parse import quote
+from datetime import datetime
+import anyio
 import logging
+import os
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_db, uuid7
 from app.services.storage_manager import get_storage_manager
+from app.services.artifact_buffer import get_artifact_buffer
 from app.models.artifact import Artifact
-from app.models.schemas import ArtifactCreate, ArtifactResponse
+from app.models.chat import ChatMessage, ChatSession
+from app.models.schemas import (
+    ArtifactCreate, ArtifactResponse, ArtifactWithMessageResponse, ChatMessageResponse
+)
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Columns projected for ArtifactResponse (listings leave out custom_metadata by default)
+_ARTIFACT_LIST_COLUMNS = (
+    Artifact.artifact_id,
+    Artifact.session_id,
+    Artifact.message_id,
+    Artifact.type,
+    Artifact.name,
+    Artifact.description,
+    Artifact.file_path,
+    Artifact.mime_type,
+    Artifact.size_bytes,
+    Artifact.created_at,
+)
+_ARTIFACT_COLUMNS = _ARTIFACT_LIST_COLUMNS + (Artifact.custom_metadata,)
+
+# Single-artifact lookups by artifact_id (not the primary key, so no Session.get).
+# Built once with a bound parameter so requests only supply the value.
+_SELECT_ARTIFACT = select(Artifact).where(Artifact.artifact_id == bindparam("artifact_id"))
+_SELECT_ARTIFACT_ROW = select(*_ARTIFACT_COLUMNS).where(
+    Artifact.artifact_id == bindparam("artifact_id")
+)
+
+# Uploads are copied to disk in 1 MiB pieces
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Artifact content is streamed in 64 KiB pieces; ?inline=1 JSON only up to this size
+CONTENT_CHUNK_SIZE = 1 << 16
+INLINE_CONTENT_MAX = 1 << 16
+
+# File extension and MIME type per artifact type
+_EXTENSIONS = {
+    "code": ".py",
+    "javascript": ".js",
+    "typescript": ".ts",
+    "document": ".md",
+    "diagram": ".svg",
+    "data": ".json"
+}
+_MIME_TYPES = {
+    "code": "text/plain",
+    "javascript": "application/javascript",
+    "typescript": "application/typescript",
+    "document": "text/markdown",
+    "diagram": "image/svg+xml",
+    "data": "application/json"
+}
+
+
+class ZeroCopyFileResponse(FileResponse):
+    """FileResponse that uses the ASGI zero-copy send extension when offered
+    
+    The server then streams the file with sendfile(2) instead of reading
+    it through Python; otherwise this behaves exactly like FileResponse.
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if "http.response.zerocopysend" not in scope.get("extensions", {}) or self.send_header_only:
+            await super().__call__(scope, receive, send)
+            return
+        
+        stat_result = self.stat_result
+        if stat_result is None:
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+            self.set_stat_headers(stat_result)
+        
+        await send({
+            "type": "http.response.start",
+            "status": self.status_code,
+            "headers": self.raw_headers,
+        })
+        with open(self.path, "rb") as file:
+            await send({
+                "type": "http.response.zerocopysend",
+                "file": file,
+                "count": stat_result.st_size,
+                "more_body": False,
+            })
+        if self.background is not None:
+            await self.background()
+
 
 @router.post("/artifacts", response_model=ArtifactResponse)
 async def create_artifact(
     artifact_create: ArtifactCreate,
     session_id: str,
+    response: Response,
     message_id: Optional[str] = None,
+    sync: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Create a new artifact"""
+    """Create a new artifact
     
-    artifact_id = str(uuid4())
-    storage_manager = get_storage_manager()
+    The file is written before returning; the database row is queued for the
+    next batched insert (202) unless sync=true commits it immediately.
+    """
     
-    # Determine file extension
-    extensions = {
-        "code": ".py",
-        "javascript": ".js",
-        "typescript": ".ts",
-        "document": ".md",
-        "diagram": ".svg",
-        "data": ".json"
-    }
+    # A queued row is inserted after the 202, so reject unknown parents up front
+    await _require_parents(db, session_id, message_id)
     
-    ext = extensions.get(artifact_create.type.value, ".txt")
-    filename = f"{artifact_create.name.replace(' ', '_')}{ext}"
+    artifact_id = str(uuid7())
+    storage_manager = get_storage_manager()
+    
+    # Determine file extension; Path().name keeps the file inside the session folder
+    ext = _EXTENSIONS.get(artifact_create.type.value, ".txt")
+    filename = Path(f"{artifact_create.name.replace(' ', '_')}{ext}").name
     
     try:
         # Save file to storage
-        file_info = storage_manager.save_artifact_file(
+        file_info = await storage_manager.save_artifact_file(
             content=artifact_create.content,
             artifact_type=artifact_create.type.value,
             session_id=session_id,
@@ -51,78 +143,126 @@ async def create_artifact(
         )
         
         # Create database record
-        artifact = Artifact(
-            artifact_id=artifact_id,
-            session_id=session_id,
-            message_id=message_id,
-            type=artifact_create.type.value,
-            name=artifact_create.name,
-            description=artifact_create.description,
-            file_path=file_info["path"],
-            mime_type=_get_mime_type(artifact_create.type.value),
-            size_bytes=file_info["size_bytes"],
-            custom_metadata=artifact_create.custom_metadata or {}
-        )
-        
-        db.add(artifact)
-        db.commit()
-        db.refresh(artifact)
+        record = {
+            "artifact_id": artifact_id,
+            "session_id": session_id,
+            "message_id": message_id,
+            "type": artifact_create.type.value,
+            "name": artifact_create.name,
+            "description": artifact_create.description,
+            "file_path": file_info["path"],
+            "mime_type": _MIME_TYPES.get(artifact_create.type.value, "text/plain"),
+            "size_bytes": file_info["size_bytes"],
+            "custom_metadata": artifact_create.custom_metadata or {},
+            "created_at": datetime.utcnow()
+        }
+        await _store_artifact_record(record, sync, response, db)
         
-        return ArtifactResponse(
-            artifact_id=artifact.artifact_id,
-            session_id=artifact.session_id,
-            message_id=artifact.message_id,
-            type=artifact.type,
-            name=artifact.name,
-            description=artifact.description,
-            file_path=artifact.file_path,
-            mime_type=artifact.mime_type,
-            size_bytes=artifact.size_bytes,
-            custom_metadata=artifact.custom_metadata,
-            created_at=artifact.created_at
-        )
+        # The record was assembled here, so skip re-validating it
+        return ArtifactResponse.model_construct(**record)
         
     except Exception as e:
         logger.error(f"Failed to create artifact: {e}")
         raise HTTPException(status_code=500, detail="Failed to create artifact")
 
 
-@router.get("/artifacts", response_model=List[ArtifactResponse])
+def get_artifacts_for_sessions(db: Session, session_ids: List[str]) -> List[Artifact]:
+    """Artifacts of several sessions in one query, newest first"""
+    if not session_ids:
+        return []
+    stmt = (
+        select(Artifact)
+        .where(Artifact.session_id.in_(session_ids))
+        .order_by(Artifact.created_at.desc())
+    )
+    return list(db.scalars(stmt))
+
+
+def _filter_and_order(stmt, session_id: Optional[str], artifact_type: Optional[str]):
+    """Apply list_artifacts filters with the cheapest newest-first ordering
+    
+    Per-session listings walk ix_art_session_created / ix_art_session_type_created
+    backwards. Without a session filter the rowid order is used instead: rows are
+    inserted in creation order, so a reverse rowid scan stops after LIMIT rows
+    rather than sorting the whole table by created_at.
+    """
+    if session_id:
+        stmt = stmt.where(Artifact.session_id == session_id)
+    
+    if artifact_type:
+        stmt = stmt.where(Artifact.type == artifact_type)
+    
+    if session_id:
+        return stmt.order_by(Artifact.created_at.desc())
+    return stmt.order_by(Artifact.id.desc())
+
+
+def log_list_query_plans(db: Session):
+    """Log SQLite's plan for each list_artifacts query shape (DEBUG startup check)"""
+    shapes = {
+        "unfiltered": (None, None),
+        "type": (None, "code"),
+        "session": ("00000000-0000-0000-0000-000000000000", None),
+        "session+type": ("00000000-0000-0000-0000-000000000000", "code"),
+    }
+    for label, (session_id, artifact_type) in shapes.items():
+        stmt = _filter_and_order(select(*_ARTIFACT_LIST_COLUMNS), session_id, artifact_type).limit(20)
+        compiled = stmt.compile(bind=db.get_bind())
+        # Parameter values don't affect the plan, so raw values are fine
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+        plan = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+        logger.debug(f"list_artifacts plan ({label}): {'; '.join(row[-1] for row in plan)}")
+
+
+@router.get(
+    "/artifacts",
+    response_model=List[Union[ArtifactWithMessageResponse, ArtifactResponse]]
+)
 async def list_artifacts(
     session_id: Optional[str] = None,
     artifact_type: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
+    include_metadata: bool = False,
+    with_messages: bool = False,
     db: Session = Depends(get_db)
 ):
-    """List artifacts with optional filtering"""
-    
-    query = db.query(Artifact)
-    
-    if session_id:
-        query = query.filter(Artifact.session_id == session_id)
-    
-    if artifact_type:
-        query = query.filter(Artifact.type == artifact_type)
-    
-    artifacts = query.order_by(Artifact.created_at.desc()).offset(skip).limit(limit).all()
-    
-    return [
-        ArtifactResponse(
-            artifact_id=artifact.artifact_id,
-            session_id=artifact.session_id,
-            message_id=artifact.message_id,
-            type=artifact.type,
-            name=artifact.name,
-            description=artifact.description,
-            file_path=artifact.file_path,
-            mime_type=artifact.mime_type,
-            size_bytes=artifact.size_bytes,
-            custom_metadata=artifact.custom_metadata,
-            created_at=artifact.created_at
-        )
-        for artifact in artifacts
-    ]
+    """List artifacts with optional filtering
+    
+    custom_metadata is only loaded when include_metadata is set, which
+    spares a JSON decode per row for plain listings. with_messages embeds
+    each artifact's source message, fetched in one extra IN query.
+    """
+    
+    # Make queued artifact rows visible first
+    await get_artifact_buffer().flush()
+    
+    if with_messages:
+        stmt = select(Artifact).options(selectinload(Artifact.message))
+    else:
+        columns = _ARTIFACT_COLUMNS if include_metadata else _ARTIFACT_LIST_COLUMNS
+        stmt = select(*columns)
+    
+    stmt = _filter_and_order(stmt, session_id, artifact_type).offset(skip).limit(limit)
+    
+    def fetch():
+        if with_messages:
+            results = []
+            for artifact in db.scalars(stmt):
+                response = ArtifactWithMessageResponse.model_validate(artifact)
+                if not include_metadata:
+                    response.custom_metadata = None
+                results.append(response)
+            return results
+        
+        # Rows come straight from the DB, so skip re-validation
+        construct = ArtifactResponse.model_construct
+        if include_metadata:
+            return [construct(**row._mapping) for row in db.execute(stmt)]
+        return [construct(custom_metadata=None, **row._mapping) for row in db.execute(stmt)]
+    
+    # Sync SQLAlchemy, so keep the query off the event loop
+    return await run_in_threadpool(fetch)
 
 
 @router.get("/artifacts/{artifact_id}", response_model=ArtifactResponse)
@@ -132,55 +272,79 @@ async def get_artifact(
 ):
     """Get a specific artifact"""
     
-    artifact = db.query(Artifact).filter(
-        Artifact.artifact_id == artifact_id
-    ).first()
+    # Make queued artifact rows visible first
+    await get_artifact_buffer().flush()
     
-    if not artifact:
+    row = await run_in_threadpool(_get_artifact_row, db, artifact_id)
+    
+    if not row:
         raise HTTPException(status_code=404, detail="Artifact not found")
     
-    return ArtifactResponse(
-        artifact_id=artifact.artifact_id,
-        session_id=artifact.session_id,
-        message_id=artifact.message_id,
-        type=artifact.type,
-        name=artifact.name,
-        description=artifact.description,
-        file_path=artifact.file_path,
-        mime_type=artifact.mime_type,
-        size_bytes=artifact.size_bytes,
-        custom_metadata=artifact.custom_metadata,
-        created_at=artifact.created_at
-    )
+    return ArtifactResponse.model_construct(**row._mapping)
 
 
 @router.get("/artifacts/{artifact_id}/content")
 async def get_artifact_content(
     artifact_id: str,
+    inline: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get the content of an artifact"""
+    """Get the content of an artifact
+    
+    The file is streamed as-is with metadata in X-Artifact-* headers.
+    inline=true returns the old JSON wrapper, for artifacts up to
+    INLINE_CONTENT_MAX bytes only.
+    """
+    
+    # Make queued artifact rows visible first
+    await get_artifact_buffer().flush()
     
-    artifact = db.query(Artifact).filter(
-        Artifact.artifact_id == artifact_id
-    ).first()
+    artifact = await run_in_threadpool(_get_artifact, db, artifact_id)
     
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
     
     storage_manager = get_storage_manager()
-    content = storage_manager.read_artifact_file(artifact.file_path)
     
-    if content is None:
+    if inline:
+        if (artifact.size_bytes or 0) > INLINE_CONTENT_MAX:
+            raise HTTPException(
+                status_code=413,
+                detail="Artifact too large for inline content; request it without inline"
+            )
+        
+        try:
+            content = await storage_manager.read_artifact_file(artifact.file_path)
+        except UnicodeDecodeError:
+            raise HTTPException(
+                status_code=415,
+                detail="binary artifact; fetch without inline"
+            )
+        
+        if content is None:
+            raise HTTPException(status_code=404, detail="Artifact file not found")
+        
+        return {
+            "artifact_id": artifact_id,
+            "name": artifact.name,
+            "type": artifact.type,
+            "content": content,
+            "mime_type": artifact.mime_type
+        }
+    
+    if not artifact.file_path or storage_manager.stat_artifact_file(artifact.file_path) is None:
         raise HTTPException(status_code=404, detail="Artifact file not found")
     
-    return {
-        "artifact_id": artifact_id,
-        "name": artifact.name,
-        "type": artifact.type,
-        "content": content,
-        "mime_type": artifact.mime_type
-    }
+    return StreamingResponse(
+        storage_manager.stream_artifact_file(artifact.file_path, CONTENT_CHUNK_SIZE),
+        media_type=artifact.mime_type or "application/octet-stream",
+        headers={
+            "X-Artifact-Id": artifact_id,
+            # Header values must be latin-1, so the name is percent-encoded
+            "X-Artifact-Name": quote(artifact.name),
+            "X-Artifact-Type": artifact.type
+        }
+    )
 
 
 @router.get("/artifacts/{artifact_id}/download")
@@ -190,21 +354,50 @@ async def download_artifact(
 ):
     """Download an artifact file"""
     
-    artifact = db.query(Artifact).filter(
-        Artifact.artifact_id == artifact_id
-    ).first()
+    # Make queued artifact rows visible first
+    await get_artifact_buffer().flush()
+    
+    artifact = await run_in_threadpool(_get_artifact, db, artifact_id)
     
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
     
-    import os
-    if not os.path.exists(artifact.file_path):
+    # Cached stat: repeated downloads skip the exists/stat syscalls
+    storage_manager = get_storage_manager()
+    stat_result = storage_manager.stat_artifact_file(artifact.file_path) if artifact.file_path else None
+    if stat_result is None:
         raise HTTPException(status_code=404, detail="Artifact file not found")
     
-    return FileResponse(
+    media_type = artifact.mime_type or "application/octet-stream"
+    
+    # Let nginx serve the file itself when configured
+    if settings.USE_X_ACCEL:
+        try:
+            relpath = Path(artifact.file_path).resolve().relative_to(
+                storage_manager.artifacts_path.resolve()
+            )
+        except ValueError:
+            relpath = None
+        if relpath is not None:
+            # Same Content-Disposition encoding as FileResponse
+            quoted_name = quote(artifact.name)
+            if quoted_name != artifact.name:
+                disposition = f"attachment; filename*=utf-8''{quoted_name}"
+            else:
+                disposition = f'attachment; filename="{artifact.name}"'
+            return Response(
+                media_type=media_type,
+                headers={
+                    "X-Accel-Redirect": f"{settings.X_ACCEL_PREFIX}/{quote(relpath.as_posix())}",
+                    "Content-Disposition": disposition
+                }
+            )
+    
+    return ZeroCopyFileResponse(
         path=artifact.file_path,
         filename=f"{artifact.name}",
-        media_type=artifact.mime_type or "application/octet-stream"
+        media_type=media_type,
+        stat_result=stat_result  # sets Content-Length without another stat()
     )
 
 
@@ -216,9 +409,10 @@ async def update_artifact(
 ):
     """Update an artifact"""
     
-    artifact = db.query(Artifact).filter(
-        Artifact.artifact_id == artifact_id
-    ).first()
+    # Make queued artifact rows visible first
+    await get_artifact_buffer().flush()
+    
+    artifact = await run_in_threadpool(_get_artifact, db, artifact_id)
     
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
@@ -227,7 +421,7 @@ async def update_artifact(
     
     try:
         # Update file content
-        file_info = storage_manager.save_artifact_file(
+        file_info = await storage_manager.save_artifact_file(
             content=artifact_update.content,
             artifact_type=artifact.type,
             session_id=artifact.session_id,
@@ -240,22 +434,9 @@ async def update_artifact(
         artifact.size_bytes = file_info["size_bytes"]
         artifact.custom_metadata = artifact_update.custom_metadata or {}
         
-        db.commit()
-        db.refresh(artifact)
+        await run_in_threadpool(_commit_and_refresh, db, artifact)
         
-        return ArtifactResponse(
-            artifact_id=artifact.artifact_id,
-            session_id=artifact.session_id,
-            message_id=artifact.message_id,
-            type=artifact.type,
-            name=artifact.name,
-            description=artifact.description,
-            file_path=artifact.file_path,
-            mime_type=artifact.mime_type,
-            size_bytes=artifact.size_bytes,
-            custom_metadata=artifact.custom_metadata,
-            created_at=artifact.created_at
-        )
+        return ArtifactResponse.model_validate(artifact)
         
     except Exception as e:
         logger.error(f"Failed to update artifact: {e}")
@@ -269,9 +450,10 @@ async def delete_artifact(
 ):
     """Delete an artifact"""
     
-    artifact = db.query(Artifact).filter(
-        Artifact.artifact_id == artifact_id
-    ).first()
+    # Make queued artifact rows visible first
+    await get_artifact_buffer().flush()
+    
+    artifact = await run_in_threadpool(_get_artifact, db, artifact_id)
     
     if not artifact:
         raise HTTPException(status_code=404, detail="Artifact not found")
@@ -282,8 +464,7 @@ async def delete_artifact(
     storage_manager.delete_artifact_file(artifact.file_path)
     
     # Delete database record
-    db.delete(artifact)
-    db.commit()
+    await run_in_threadpool(_delete_and_commit, db, artifact)
     
     return {"status": "deleted", "artifact_id": artifact_id}
 
@@ -293,45 +474,43 @@ async def upload_artifact(
     session_id: str,
     artifact_type: str,
     name: str,
+    response: Response,
     file: UploadFile = File(...),
     description: Optional[str] = None,
     message_id: Optional[str] = None,
+    sync: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Upload an artifact file"""
+    """Upload an artifact file (row is batched like create_artifact unless sync=true)"""
+    
+    await _require_parents(db, session_id, message_id)
     
-    artifact_id = str(uuid4())
+    artifact_id = str(uuid7())
     storage_manager = get_storage_manager()
     
     try:
-        # Read file content
-        content = await file.read()
-        content_str = content.decode("utf-8")
-        
-        # Save file
-        file_info = storage_manager.save_artifact_file(
-            content=content_str,
+        # Stream the upload to disk as raw bytes, chunk by chunk
+        file_info = await storage_manager.save_artifact_stream(
+            chunks=_read_chunks(file),
             artifact_type=artifact_type,
             session_id=session_id,
-            filename=file.filename or name
+            filename=Path(file.filename or name).name
         )
         
         # Create database record
-        artifact = Artifact(
-            artifact_id=artifact_id,
-            session_id=session_id,
-            message_id=message_id,
-            type=artifact_type,
-            name=name,
-            description=description,
-            file_path=file_info["path"],
-            mime_type=file.content_type or _get_mime_type(artifact_type),
-            size_bytes=file_info["size_bytes"]
-        )
-        
-        db.add(artifact)
-        db.commit()
-        db.refresh(artifact)
+        record = {
+            "artifact_id": artifact_id,
+            "session_id": session_id,
+            "message_id": message_id,
+            "type": artifact_type,
+            "name": name,
+            "description": description,
+            "file_path": file_info["path"],
+            "mime_type": file.content_type or _MIME_TYPES.get(artifact_type, "text/plain"),
+            "size_bytes": file_info["size_bytes"],
+            "created_at": datetime.utcnow()
+        }
+        await _store_artifact_record(record, sync, response, db)
         
         return {
             "artifact_id": artifact_id,
@@ -345,14 +524,66 @@ async def upload_artifact(
         raise HTTPException(status_code=500, detail="Failed to upload artifact")
 
 
-def _get_mime_type(artifact_type: str) -> str:
-    """Get MIME type for artifact type"""
-    mime_types = {
-        "code": "text/plain",
-        "javascript": "application/javascript",
-        "typescript": "application/typescript",
-        "document": "text/markdown",
-        "diagram": "image/svg+xml",
-        "data": "application/json"
-    }
-    return mime_types.get(artifact_type, "text/plain")
\ No newline at end of file
+# Blocking database helpers; handlers call them through run_in_threadpool
+
+def _get_artifact(db: Session, artifact_id: str) -> Optional[Artifact]:
+    """Load one artifact by artifact_id, or None"""
+    return db.execute(_SELECT_ARTIFACT, {"artifact_id": artifact_id}).scalar_one_or_none()
+
+
+def _get_artifact_row(db: Session, artifact_id: str):
+    """Load one artifact's response columns by artifact_id, or None"""
+    return db.execute(_SELECT_ARTIFACT_ROW, {"artifact_id": artifact_id}).first()
+
+
+def _add_and_commit(db: Session, record: dict):
+    """Insert one artifact row and commit"""
+    db.add(Artifact(**record))
+    db.commit()
+
+
+def _commit_and_refresh(db: Session, artifact: Artifact):
+    """Commit pending changes and reload the artifact"""
+    db.commit()
+    db.refresh(artifact)
+
+
+def _delete_and_commit(db: Session, artifact: Artifact):
+    """Delete the artifact row and commit"""
+    db.delete(artifact)
+    db.commit()
+
+
+def _parents_exist(db: Session, session_id: str, message_id: Optional[str]) -> bool:
+    """Whether the session (and the message, if given) exist"""
+    if db.execute(select(ChatSession.id).where(ChatSession.session_id == session_id)).first() is None:
+        return False
+    if message_id is not None:
+        return db.execute(select(ChatMessage.id).where(ChatMessage.message_id == message_id)).first() is not None
+    return True
+
+
+async def _require_parents(db: Session, session_id: str, message_id: Optional[str]):
+    """404 unless the artifact's session and message exist"""
+    if not await run_in_threadpool(_parents_exist, db, session_id, message_id):
+        raise HTTPException(status_code=404, detail="Session or message not found")
+
+
+async def _store_artifact_record(record: dict, sync: bool, response: Response, db: Session):
+    """Commit the artifact row now, or queue it for the batched writer (202)"""
+    if sync:
+        try:
+            await run_in_threadpool(_add_and_commit, db, record)
+        except Exception:
+            # No row will point at the file
+            get_storage_manager().delete_artifact_file(record["file_path"])
+            raise
+    else:
+        get_artifact_buffer().enqueue(record)
+        response.status_code = 202
+
+
+async def _read_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    """Yield an upload in UPLOAD_CHUNK_SIZE pieces"""
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        yield chunk
@@ -1,16 +1,64 @@
 """AWS Q MCP API endpoints for managing MCP servers via AWS Q configuration"""
 
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 from pathlib import Path
+import aiofiles
+import asyncio
 import logging
+import os
 
 from app.core.awsq_mcp_adapter import get_awsq_mcp_manager, AWSQConfigLoader
+from app.core.executors import get_io_pool
 from app.models.schemas import MCPServerResponse, MCPResourceResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1/awsq-mcp", tags=["AWS Q MCP"])
 
+# Parsed configurations keyed by path: (st_mtime_ns, st_size, config, server names)
+_CONFIG_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any], List[str]]] = {}
+
+
+def _load_cached_configuration(config_file: Path) -> Optional[Tuple[Dict[str, Any], List[str]]]:
+    """Load a configuration file, reusing the parsed result while it is unchanged on disk"""
+    try:
+        stat = os.stat(config_file)
+    except OSError:
+        _CONFIG_CACHE.pop(config_file, None)
+        return None
+
+    cached = _CONFIG_CACHE.get(config_file)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2], cached[3]
+
+    config = AWSQConfigLoader.load_configuration(config_file)
+    if not config:
+        _CONFIG_CACHE.pop(config_file, None)
+        return None
+
+    servers = list(AWSQConfigLoader.extract_mcp_servers(config).keys())
+    _CONFIG_CACHE[config_file] = (stat.st_mtime_ns, stat.st_size, config, servers)
+    return config, servers
+
+
+# Docker labels describing how a containerised MCP server can run over STDIO
+_MCP_COMMAND_LABEL = "mcp-command"
+_MCP_ARGS_LABEL = "mcp-args"
+_MCP_ENV_LABEL = "mcp-env"
+_NO_LABELS: Dict[str, str] = {}  # read-only fallback, never mutated
+
+# Shared Docker discovery instance so the Docker client connection is reused
+_discovery = None
+
+
+def _get_discovery():
+    """Get or create the shared MCPDiscovery instance"""
+    global _discovery
+    if _discovery is None:
+        from app.core.mcp_client import MCPDiscovery
+        _discovery = MCPDiscovery()
+    return _discovery
+
 
 @router.get("/configurations")
 async def list_configurations() -> Dict[str, Any]:
@@ -20,19 +68,34 @@ async def list_configurations() -> Dict[str, Any]:
         global_configs = AWSQConfigLoader.find_config_files()
         project_configs = AWSQConfigLoader.find_config_files(Path.cwd())
 
+        found_files = set(global_configs + project_configs)
+        # Files under ~/.aws are global; the legacy .amazonq/mcp.json is cwd-relative
+        global_files = frozenset(path for path in global_configs if ".aws" in path.parts)
+        config_files = list(found_files)
         configurations = []
 
-        # Load and parse configurations
-        for config_file in set(global_configs + project_configs):
-            config = AWSQConfigLoader.load_configuration(config_file)
-            if config:
-                mcp_servers = AWSQConfigLoader.extract_mcp_servers(config)
+        # Evict cache entries for files that no longer exist
+        for stale in [path for path in _CONFIG_CACHE if path not in found_files]:
+            del _CONFIG_CACHE[stale]
+
+        # Load and parse configurations in parallel off the event loop
+        # (unchanged files come from the cache)
+        loop = asyncio.get_running_loop()
+        io_pool = get_io_pool()
+        results = await asyncio.gather(*(
+            loop.run_in_executor(io_pool, _load_cached_configuration, config_file)
+            for config_file in config_files
+        ))
+
+        for config_file, loaded in zip(config_files, results):
+            if loaded:
+                config, servers = loaded
                 configurations.append({
                     "file": str(config_file),
                     "name": config.get("name"),
                     "description": config.get("description"),
-                    "servers": list(mcp_servers.keys()),
-                    "scope": "global" if ".aws" in str(config_file) else "project"
+                    "servers": servers,
+                    "scope": "global" if config_file in global_files else "project"
                 })
 
         return {
@@ -169,10 +232,9 @@ async def migrate_from_docker() -> Dict[str, Any]:
     This helps users migrate from docker-compose to AWS Q MCP configuration.
     """
     try:
-        from app.core.mcp_client import MCPDiscovery
-        import json
+        import orjson
 
-        discovery = MCPDiscovery()
+        discovery = _get_discovery()
         docker_servers = await discovery.discover_servers()
 
         # Generate AWS Q configuration suggestions
@@ -184,34 +246,42 @@ async def migrate_from_docker() -> Dict[str, Any]:
 
         migration_notes = []
 
+        # Bind hot lookups once for the loop below
+        add_note = migration_notes.append
+        loads = orjson.loads
+        servers_out = suggested_config["mcpServers"]
+
         for server in docker_servers:
             server_name = server["name"]
-            labels = server.get("labels", {})
+            labels = server.get("labels") or _NO_LABELS
+            get_label = labels.get
+            command = get_label(_MCP_COMMAND_LABEL)
 
             # Determine if it can be run as STDIO or needs HTTP
-            if labels.get("mcp-command"):
+            if command:
                 # Can be converted to STDIO
-                suggested_config["mcpServers"][server_name] = {
-                    "command": labels["mcp-command"],
-                    "args": json.loads(labels.get("mcp-args", "[]")),
-                    "env": json.loads(labels.get("mcp-env", "{}")),
+                servers_out[server_name] = {
+                    "command": command,
+                    "args": loads(get_label(_MCP_ARGS_LABEL) or "[]"),
+                    "env": loads(get_label(_MCP_ENV_LABEL) or "{}"),
                     "timeout": 30000
                 }
-                migration_notes.append(f"✓ {server_name}: Can be migrated to STDIO transport")
+                add_note(f"✓ {server_name}: Can be migrated to STDIO transport")
             else:
                 # Keep as HTTP
-                suggested_config["mcpServers"][server_name] = {
+                servers_out[server_name] = {
                     "type": "http",
                     "url": server["endpoint"]
                 }
-                migration_notes.append(f"⚠ {server_name}: Will use HTTP transport (requires running container)")
+                add_note(f"⚠ {server_name}: Will use HTTP transport (requires running container)")
 
         # Save suggested configuration
         output_path = Path(".amazonq/cli-agents/migrated.json")
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, 'w') as f:
-            json.dump(suggested_config, f, indent=2)
+        payload = orjson.dumps(suggested_config, option=orjson.OPT_INDENT_2)
+        async with aiofiles.open(output_path, 'wb') as f:
+            await f.write(payload)
 
         return {
             "success": True,
@@ -1,28 +1,65 @@
 """Chat API endpoints"""
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import Session, aliased
+from datetime import datetime
+from typing import Dict, List, Optional
 from uuid import uuid4
 import time
 import logging
+import orjson
 
-from app.core.database import get_db
+from app.core.database import get_db, SessionLocal
 from app.core.llm_manager import get_llm_manager
 from app.core.mcp_client import get_mcp_manager
 from app.models.chat import ChatSession, ChatMessage
+from app.services.artifact_buffer import get_artifact_buffer
+from app.services.generation_queue import get_generation_queue
+from app.services.query_store import get_query_store
 from app.models.schemas import (
     ChatSessionCreate, ChatSessionResponse, 
-    ChatMessageCreate, ChatMessageResponse,
+    ChatMessageCreate, ChatMessageResponse, ChatMessageDict, ChatMessageBatchRequest,
     QueryRequest, QueryResponse, QueryResult
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# In-memory query store for async processing
-processing_queries = {}
-completed_queries = {}
+
+def _query_sessions_with_counts(db: Session):
+    """(ChatSession, message count) rows, counted in the same query"""
+    return db.query(ChatSession, func.count(ChatMessage.id)).outerjoin(
+        ChatMessage, ChatMessage.session_id == ChatSession.session_id
+    ).group_by(ChatSession.id)
+
+
+def _session_response(session: ChatSession, message_count: int) -> ChatSessionResponse:
+    """Build the API response for a session (ORM values are trusted, so no validation)"""
+    return ChatSessionResponse.model_construct(
+        session_id=session.session_id,
+        title=session.title,
+        created_at=session.created_at,
+        updated_at=session.updated_at,
+        model_used=session.model_used,
+        message_count=message_count,
+        total_tokens=session.total_tokens or 0
+    )
+
+
+def _message_dict(msg: ChatMessage) -> ChatMessageDict:
+    """Plain-dict message row for ORJSONResponse (no per-row model validation)"""
+    return {
+        "message_id": msg.message_id,
+        "session_id": msg.session_id,
+        "role": msg.role,
+        "content": msg.content,
+        "mcp_resources_used": msg.mcp_resources_used,
+        "timestamp": msg.timestamp,
+        "tokens_used": msg.tokens_used,
+        "processing_time": msg.processing_time
+    }
 
 
 @router.post("/chat/sessions", response_model=ChatSessionResponse)
@@ -44,13 +81,7 @@ async def create_chat_session(
     db.commit()
     db.refresh(session)
     
-    return ChatSessionResponse(
-        session_id=session.session_id,
-        title=session.title,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        model_used=session.model_used
-    )
+    return _session_response(session, 0)
 
 
 @router.get("/chat/sessions", response_model=List[ChatSessionResponse])
@@ -60,20 +91,10 @@ async def list_chat_sessions(
     db: Session = Depends(get_db)
 ):
     """List all chat sessions"""
-    sessions = db.query(ChatSession).offset(skip).limit(limit).all()
-    
-    return [
-        ChatSessionResponse(
-            session_id=session.session_id,
-            title=session.title,
-            created_at=session.created_at,
-            updated_at=session.updated_at,
-            model_used=session.model_used,
-            message_count=len(session.messages),
-            total_tokens=session.total_tokens or 0
-        )
-        for session in sessions
-    ]
+    # One aggregate query instead of a lazy messages load per session
+    rows = _query_sessions_with_counts(db).offset(skip).limit(limit).all()
+    
+    return [_session_response(session, message_count) for session, message_count in rows]
 
 
 @router.get("/chat/sessions/{session_id}", response_model=ChatSessionResponse)
@@ -82,32 +103,30 @@ async def get_chat_session(
     db: Session = Depends(get_db)
 ):
     """Get a specific chat session"""
-    session = db.query(ChatSession).filter(
+    row = _query_sessions_with_counts(db).filter(
         ChatSession.session_id == session_id
     ).first()
     
-    if not session:
+    if not row:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return ChatSessionResponse(
-        session_id=session.session_id,
-        title=session.title,
-        created_at=session.created_at,
-        updated_at=session.updated_at,
-        model_used=session.model_used,
-        message_count=len(session.messages),
-        total_tokens=session.total_tokens or 0
-    )
+    return _session_response(*row)
 
 
 @router.get("/chat/sessions/{session_id}/messages", response_model=List[ChatMessageResponse])
 async def get_session_messages(
     session_id: str,
+    cursor: Optional[str] = None,
     skip: int = 0,
     limit: int = 50,
     db: Session = Depends(get_db)
 ):
-    """Get messages for a chat session"""
+    """Get messages for a chat session
+    
+    Page with cursor (the X-Next-Cursor header of the previous page): it seeks
+    straight to the next message on the (session_id, timestamp) index, while
+    skip has to read and discard every earlier row.
+    """
     session = db.query(ChatSession).filter(
         ChatSession.session_id == session_id
     ).first()
@@ -115,34 +134,71 @@ async def get_session_messages(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    messages = db.query(ChatMessage).filter(
-        ChatMessage.session_id == session_id
-    ).order_by(ChatMessage.timestamp).offset(skip).limit(limit).all()
-    
-    return [
-        ChatMessageResponse(
-            message_id=msg.message_id,
-            session_id=msg.session_id,
-            role=msg.role,
-            content=msg.content,
-            mcp_resources_used=msg.mcp_resources_used,
-            timestamp=msg.timestamp,
-            tokens_used=msg.tokens_used,
-            processing_time=msg.processing_time
-        )
-        for msg in messages
-    ]
+    query = db.query(ChatMessage).filter(ChatMessage.session_id == session_id)
+    if cursor is not None:
+        # Cursor is "<timestamp>_<id>": the id breaks ties between equal timestamps
+        try:
+            after_ts, after_id = cursor.rsplit("_", 1)
+            after = (datetime.fromisoformat(after_ts), int(after_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(ChatMessage.timestamp, ChatMessage.id) > after)
+    query = query.order_by(ChatMessage.timestamp, ChatMessage.id)
+    if cursor is None and skip:
+        query = query.offset(skip)
+    messages = query.limit(limit).all()
+    
+    # Rows come straight from the database, so skip per-row model validation
+    rows: List[ChatMessageDict] = [_message_dict(msg) for msg in messages]
+    
+    # A full page may have more after it; the body stays a plain list
+    headers = {}
+    if messages and len(messages) == limit:
+        headers["X-Next-Cursor"] = f"{messages[-1].timestamp.isoformat()}_{messages[-1].id}"
+    return ORJSONResponse(rows, headers=headers)
+
+
+@router.post("/chat/messages/batch", response_model=Dict[str, List[ChatMessageResponse]])
+async def get_recent_messages_batch(
+    batch: ChatMessageBatchRequest,
+    db: Session = Depends(get_db)
+):
+    """Most recent `limit` messages of each requested session, in one query
+    
+    Returns {session_id: [messages oldest first]}; unknown sessions map to [].
+    """
+    # Rank each session's messages newest first and keep the top `limit`
+    rank = func.row_number().over(
+        partition_by=ChatMessage.session_id,
+        order_by=(ChatMessage.timestamp.desc(), ChatMessage.id.desc())
+    ).label("rank")
+    ranked = select(ChatMessage, rank).where(
+        ChatMessage.session_id.in_(batch.session_ids)
+    ).subquery()
+    recent = aliased(ChatMessage, ranked)
+    messages = db.query(recent).filter(ranked.c.rank <= batch.limit).order_by(
+        ranked.c.timestamp, ranked.c.id
+    ).all()
+    
+    result: Dict[str, List[ChatMessageDict]] = {session_id: [] for session_id in batch.session_ids}
+    for msg in messages:
+        result.setdefault(msg.session_id, []).append(_message_dict(msg))
+    return ORJSONResponse(result)
 
 
 @router.post("/chat/sessions/{session_id}/messages", response_model=ChatMessageResponse)
 async def send_message(
     session_id: str,
     message_create: ChatMessageCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Send a message in a chat session"""
     
+    # Reject before storing anything if generation is backed up
+    generation_queue = get_generation_queue()
+    if generation_queue.full():
+        raise HTTPException(status_code=503, detail="Too many pending generations, try again later")
+    
     # Verify session exists
     session = db.query(ChatSession).filter(
         ChatSession.session_id == session_id
@@ -166,8 +222,8 @@ async def send_message(
     # Process query and generate response
     assistant_message_id = str(uuid4())
     
-    # Start background processing
-    background_tasks.add_task(
+    # Queue generation for the worker tasks
+    generation_queue.enqueue(
         process_message,
         session_id,
         assistant_message_id,
@@ -177,13 +233,16 @@ async def send_message(
         session.model_used or "phi3:mini"
     )
     
-    # Return user message immediately
-    return ChatMessageResponse(
+    # Return user message immediately (built from values just stored, so no validation)
+    return ChatMessageResponse.model_construct(
         message_id=user_message_id,
         session_id=session_id,
         role="user",
         content=message_create.content,
-        timestamp=user_message.timestamp
+        mcp_resources_used=None,
+        timestamp=user_message.timestamp,
+        tokens_used=None,
+        processing_time=None
     )
 
 
@@ -198,93 +257,83 @@ async def process_message(
     """Process message and generate AI response"""
     start_time = time.time()
     
-    try:
-        # Get database session
-        from app.core.database import SessionLocal
-        db = SessionLocal()
-        
-        # Get LLM and MCP managers
-        llm_manager = get_llm_manager()
-        mcp_manager = get_mcp_manager()
-        
-        # Gather MCP resources if enabled
-        mcp_resources = []
-        if use_mcp:
-            try:
-                all_resources = await mcp_manager.get_all_resources()
-                
-                # Filter by specific servers if requested
-                if mcp_servers:
-                    for server_id in mcp_servers:
-                        if server_id in all_resources:
-                            mcp_resources.extend(all_resources[server_id])
-                else:
-                    # Use all available resources
+    # One session for the whole task; the error path reuses it after a rollback
+    with SessionLocal() as db:
+        try:
+            # Get LLM and MCP managers
+            llm_manager = get_llm_manager()
+            mcp_manager = get_mcp_manager()
+            
+            # Gather MCP resources if enabled
+            mcp_resources = []
+            if use_mcp:
+                try:
+                    # Only the requested servers are queried (concurrently), not all of them
+                    all_resources = await mcp_manager.get_all_resources(mcp_servers or None)
                     for resources in all_resources.values():
                         mcp_resources.extend(resources)
-                        
-            except Exception as e:
-                logger.error(f"Failed to get MCP resources: {e}")
-        
-        # Format prompt with context
-        prompt = llm_manager.format_prompt(
-            user_query=content,
-            mcp_resources=mcp_resources[:10]  # Limit to prevent token overflow
-        )
-        
-        # Generate response
-        result = llm_manager.generate(
-            prompt=prompt,
-            model=model,
-            max_tokens=512
-        )
-        
-        processing_time = time.time() - start_time
-        
-        # Save assistant message
-        assistant_message = ChatMessage(
-            message_id=message_id,
-            session_id=session_id,
-            role="assistant",
-            content=result["response"],
-            mcp_resources_used={"resources": mcp_resources[:5]} if mcp_resources else None,
-            tokens_used=result["tokens"],
-            processing_time=processing_time
-        )
-        
-        db.add(assistant_message)
-        
-        # Update session token count
-        session = db.query(ChatSession).filter(
-            ChatSession.session_id == session_id
-        ).first()
-        
-        if session:
-            session.total_tokens = (session.total_tokens or 0) + result["tokens"]["total"]
-        
-        db.commit()
-        db.close()
-        
-        logger.info(f"Message processed in {processing_time:.2f}s")
-        
-    except Exception as e:
-        logger.error(f"Error processing message: {e}")
-        
-        # Save error response
-        from app.core.database import SessionLocal
-        db = SessionLocal()
-        
-        error_message = ChatMessage(
-            message_id=message_id,
-            session_id=session_id,
-            role="assistant",
-            content=f"I apologize, but I encountered an error processing your request: {str(e)}",
-            processing_time=time.time() - start_time
-        )
-        
-        db.add(error_message)
-        db.commit()
-        db.close()
+                            
+                except Exception as e:
+                    logger.error(f"Failed to get MCP resources: {e}")
+            
+            # Format prompt with context
+            prompt = llm_manager.format_prompt(
+                user_query=content,
+                mcp_resources=mcp_resources[:10]  # Limit to prevent token overflow
+            )
+            
+            # Generate response
+            result = await llm_manager.agenerate(
+                prompt=prompt,
+                model=model,
+                max_tokens=512
+            )
+            
+            processing_time = time.time() - start_time
+            
+            # Save assistant message
+            assistant_message = ChatMessage(
+                message_id=message_id,
+                session_id=session_id,
+                role="assistant",
+                content=result["response"],
+                mcp_resources_used={"resources": mcp_resources[:5]} if mcp_resources else None,
+                prompt_tokens=result["tokens"]["prompt"],
+                response_tokens=result["tokens"]["response"],
+                total_tokens=result["tokens"]["total"],
+                processing_time=processing_time
+            )
+            
+            db.add(assistant_message)
+            
+            # Update session token count
+            session = db.query(ChatSession).filter(
+                ChatSession.session_id == session_id
+            ).first()
+            
+            if session:
+                session.total_tokens = (session.total_tokens or 0) + result["tokens"]["total"]
+            
+            db.commit()
+            
+            logger.info(f"Message processed in {processing_time:.2f}s")
+            
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            
+            # Save error response, dropping anything half-written above
+            db.rollback()
+            
+            error_message = ChatMessage(
+                message_id=message_id,
+                session_id=session_id,
+                role="assistant",
+                content=f"I apologize, but I encountered an error processing your request: {str(e)}",
+                processing_time=time.time() - start_time
+            )
+            
+            db.add(error_message)
+            db.commit()
 
 
 @router.delete("/chat/sessions/{session_id}")
@@ -293,15 +342,18 @@ async def delete_chat_session(
     db: Session = Depends(get_db)
 ):
     """Delete a chat session and all its data"""
-    session = db.query(ChatSession).filter(
+    # Queued artifact rows must land before the cascade removes their session
+    await get_artifact_buffer().flush()
+    
+    # One DELETE without loading the row; the ON DELETE CASCADE foreign keys
+    # (foreign_keys=ON) remove its messages and artifacts in the database
+    deleted = db.query(ChatSession).filter(
         ChatSession.session_id == session_id
-    ).first()
+    ).delete(synchronize_session=False)
     
-    if not session:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    # Delete session (cascades to messages and artifacts)
-    db.delete(session)
     db.commit()
     
     # TODO: Clean up artifact files
@@ -314,23 +366,26 @@ async def delete_chat_session(
 # Simple query endpoint for direct queries
 @router.post("/query", response_model=QueryResponse)
 async def submit_query(
-    query_request: QueryRequest,
-    background_tasks: BackgroundTasks
+    query_request: QueryRequest
 ):
     """Submit a direct query for processing"""
+    generation_queue = get_generation_queue()
+    if generation_queue.full():
+        raise HTTPException(status_code=503, detail="Too many pending generations, try again later")
+    
     query_id = str(uuid4())
     
     # Store query for processing
-    processing_queries[query_id] = {
+    get_query_store().start(query_id, {
         "query": query_request.query,
         "session_id": query_request.session_id,
         "model": query_request.model or "phi3:mini",
         "use_mcp": query_request.use_mcp,
         "created_at": time.time()
-    }
+    })
     
-    # Start background processing
-    background_tasks.add_task(process_direct_query, query_id)
+    # Queue generation for the worker tasks
+    generation_queue.enqueue(process_direct_query, query_id)
     
     return QueryResponse(
         query_id=query_id,
@@ -342,29 +397,60 @@ async def submit_query(
 @router.get("/query/{query_id}/status")
 async def get_query_status(query_id: str):
     """Get the status of a query"""
-    if query_id in completed_queries:
-        return {"status": "completed", "query_id": query_id}
-    elif query_id in processing_queries:
-        return {"status": "processing", "query_id": query_id}
-    else:
+    status = get_query_store().status(query_id)
+    if status is None:
         raise HTTPException(status_code=404, detail="Query not found")
+    return {"status": status, "query_id": query_id}
 
 
 @router.get("/query/{query_id}/result", response_model=QueryResult)
 async def get_query_result(query_id: str):
     """Get the result of a completed query"""
-    if query_id not in completed_queries:
+    result = get_query_store().get_result(query_id)
+    if result is None:
         raise HTTPException(status_code=404, detail="Query result not found")
     
-    return completed_queries[query_id]
+    return result
+
+
+@router.get("/query/{query_id}/stream")
+async def stream_query(query_id: str):
+    """Stream a query's response as Server-Sent Events
+    
+    Chunks arrive as `data: {"chunk": ...}` events while they are generated, then a
+    final `event: result` carries the full QueryResult, so clients need not poll.
+    """
+    query_store = get_query_store()
+    result = query_store.get_result(query_id)
+    stream = query_store.get_stream(query_id) if result is None else None
+    if result is None and stream is None:
+        raise HTTPException(status_code=404, detail="Query not found")
+    
+    async def events():
+        if stream is not None:
+            async for chunk in stream.follow():
+                yield b"data: " + orjson.dumps({"chunk": chunk}) + b"\n\n"
+        
+        final = result or query_store.get_result(query_id)
+        if final is None:
+            yield b"event: error\ndata: " + orjson.dumps({"detail": "Query result expired"}) + b"\n\n"
+            return
+        yield b"event: result\ndata: " + orjson.dumps(final.model_dump()) + b"\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 async def process_direct_query(query_id: str):
     """Process a direct query"""
-    if query_id not in processing_queries:
+    query_store = get_query_store()
+    query_data = query_store.get_processing(query_id)
+    if query_data is None:
         return
     
-    query_data = processing_queries[query_id]
     start_time = time.time()
     
     try:
@@ -387,31 +473,42 @@ async def process_direct_query(query_id: str):
             mcp_resources=mcp_resources[:10]
         )
         
-        result = llm_manager.generate(
+        # Streamed so /query/{id}/stream followers see chunks as they are generated
+        stream = query_store.get_stream(query_id)
+        stats: Dict[str, int] = {}
+        chunks = []
+        async for chunk in llm_manager.astream(
             prompt=prompt,
-            model=query_data["model"]
-        )
+            model=query_data["model"],
+            stats=stats
+        ):
+            chunks.append(chunk)
+            if stream is not None:
+                stream.append(chunk)
         
         processing_time = time.time() - start_time
+        prompt_tokens = stats.get("prompt", 0)
+        response_tokens = stats.get("response", 0)
         
-        # Store result
-        completed_queries[query_id] = QueryResult(
+        # Store result (removes it from processing)
+        query_store.complete(query_id, QueryResult(
             query_id=query_id,
-            response=result["response"],
+            response="".join(chunks),
             mcp_resources_used=mcp_resources[:5] if mcp_resources else [],
             processing_time=processing_time,
             model_used=query_data["model"],
-            tokens_used=result["tokens"],
+            tokens_used={
+                "prompt": prompt_tokens,
+                "response": response_tokens,
+                "total": prompt_tokens + response_tokens
+            },
             artifacts=[]  # TODO: Handle artifacts
-        )
-        
-        # Remove from processing
-        del processing_queries[query_id]
+        ))
         
     except Exception as e:
         logger.error(f"Error processing direct query: {e}")
         
-        completed_queries[query_id] = QueryResult(
+        query_store.complete(query_id, QueryResult(
             query_id=query_id,
             response=f"Error processing query: {str(e)}",
             mcp_resources_used=[],
@@ -419,6 +516,4 @@ async def process_direct_query(query_id: str):
             model_used=query_data["model"],
             tokens_used={"prompt": 0, "response": 0, "total": 0},
             artifacts=[]
-        )
-        
-        del processing_queries[query_id]
\ No newline at end of file
+        ))
\ No newline at end of file
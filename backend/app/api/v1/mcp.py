@@ -1,37 +1,33 @@
 """MCP Server API endpoints"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import ORJSONResponse
 from typing import List, Dict, Any
 import logging
 
-from app.core.mcp_client import get_mcp_manager
+from app.core.mcp_client import MCPClient, get_mcp_manager
 from app.models.schemas import MCPServerInfo, MCPExecuteRequest, MCPExecuteResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _get_client(server_id: str) -> MCPClient:
+    """Dependency resolving server_id to its client, 404 if unknown"""
+    client = get_mcp_manager().clients.get(server_id)
+    if client is None:
+        raise HTTPException(status_code=404, detail="MCP server not found")
+    return client
+
+
 @router.get("/mcp/servers", response_model=List[MCPServerInfo])
 async def list_mcp_servers():
     """List all registered MCP servers"""
     
     mcp_manager = get_mcp_manager()
     
-    servers = []
-    for server_id, client in mcp_manager.clients.items():
-        servers.append(MCPServerInfo(
-            server_id=server_id,
-            name=client.name,
-            container_id=getattr(client, 'container_id', None),
-            endpoint=client.endpoint,
-            status="connected" if client.is_connected else "disconnected",
-            is_active=client.is_connected,
-            capabilities=client.capabilities,
-            last_health_check=None,  # TODO: Implement health check tracking
-            error_message=None
-        ))
-    
-    return servers
+    # Cached snapshot; the manager rebuilds it when servers or their state change
+    return mcp_manager.get_server_info()
 
 
 @router.post("/mcp/discover")
@@ -53,16 +49,9 @@ async def discover_mcp_servers():
 
 
 @router.get("/mcp/servers/{server_id}/resources")
-async def list_server_resources(server_id: str):
+async def list_server_resources(server_id: str, client: MCPClient = Depends(_get_client)):
     """List resources from a specific MCP server"""
     
-    mcp_manager = get_mcp_manager()
-    
-    if server_id not in mcp_manager.clients:
-        raise HTTPException(status_code=404, detail="MCP server not found")
-    
-    client = mcp_manager.clients[server_id]
-    
     try:
         resources = await client.list_resources()
         return {
@@ -75,16 +64,9 @@ async def list_server_resources(server_id: str):
 
 
 @router.get("/mcp/servers/{server_id}/tools")
-async def list_server_tools(server_id: str):
+async def list_server_tools(server_id: str, client: MCPClient = Depends(_get_client)):
     """List tools from a specific MCP server"""
     
-    mcp_manager = get_mcp_manager()
-    
-    if server_id not in mcp_manager.clients:
-        raise HTTPException(status_code=404, detail="MCP server not found")
-    
-    client = mcp_manager.clients[server_id]
-    
     try:
         tools = await client.list_tools()
         return {
@@ -97,16 +79,9 @@ async def list_server_tools(server_id: str):
 
 
 @router.get("/mcp/servers/{server_id}/prompts")
-async def list_server_prompts(server_id: str):
+async def list_server_prompts(server_id: str, client: MCPClient = Depends(_get_client)):
     """List prompts from a specific MCP server"""
     
-    mcp_manager = get_mcp_manager()
-    
-    if server_id not in mcp_manager.clients:
-        raise HTTPException(status_code=404, detail="MCP server not found")
-    
-    client = mcp_manager.clients[server_id]
-    
     try:
         prompts = await client.list_prompts()
         return {
@@ -148,16 +123,13 @@ async def execute_mcp_tool(request: MCPExecuteRequest):
 
 
 @router.get("/mcp/servers/{server_id}/resources/{resource_uri}")
-async def read_mcp_resource(server_id: str, resource_uri: str):
+async def read_mcp_resource(
+    server_id: str,
+    resource_uri: str,
+    client: MCPClient = Depends(_get_client)
+):
     """Read a specific resource from an MCP server"""
     
-    mcp_manager = get_mcp_manager()
-    
-    if server_id not in mcp_manager.clients:
-        raise HTTPException(status_code=404, detail="MCP server not found")
-    
-    client = mcp_manager.clients[server_id]
-    
     try:
         # Decode URI if needed
         import urllib.parse
@@ -183,17 +155,11 @@ async def read_mcp_resource(server_id: str, resource_uri: str):
 async def get_mcp_prompt(
     server_id: str, 
     prompt_name: str,
-    arguments: Dict[str, Any] = None
+    arguments: Dict[str, Any] = None,
+    client: MCPClient = Depends(_get_client)
 ):
     """Get a prompt template from an MCP server"""
     
-    mcp_manager = get_mcp_manager()
-    
-    if server_id not in mcp_manager.clients:
-        raise HTTPException(status_code=404, detail="MCP server not found")
-    
-    client = mcp_manager.clients[server_id]
-    
     try:
         prompt = await client.get_prompt(prompt_name, arguments or {})
         
@@ -213,18 +179,12 @@ async def get_mcp_prompt(
 
 
 @router.post("/mcp/servers/{server_id}/health")
-async def check_server_health(server_id: str):
+async def check_server_health(server_id: str, client: MCPClient = Depends(_get_client)):
     """Check health of a specific MCP server"""
     
-    mcp_manager = get_mcp_manager()
-    
-    if server_id not in mcp_manager.clients:
-        raise HTTPException(status_code=404, detail="MCP server not found")
-    
-    client = mcp_manager.clients[server_id]
-    
     try:
         is_healthy = await client.health_check()
+        get_mcp_manager().invalidate_server_info()
         return {
             "server_id": server_id,
             "healthy": is_healthy,
@@ -250,7 +210,7 @@ async def check_all_servers_health():
         health_results = await mcp_manager.health_check_all()
         
         return {
-            "total_servers": len(mcp_manager.clients),
+            "total_servers": len(health_results),
             "healthy_servers": sum(1 for healthy in health_results.values() if healthy),
             "results": {
                 server_id: {
@@ -322,10 +282,11 @@ async def get_all_resources():
     try:
         all_resources = await mcp_manager.get_all_resources()
         
-        return {
+        # Plain JSON from the servers; skip jsonable_encoder's walk over it
+        return ORJSONResponse({
             "total_servers": len(all_resources),
             "resources": all_resources
-        }
+        })
     except Exception as e:
         logger.error(f"Failed to get all resources: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get resources: {str(e)}")
\ No newline at end of file
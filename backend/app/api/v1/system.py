@@ -1,9 +1,16 @@
 """System API endpoints for health, monitoring, and management"""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
 from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
+import orjson
 import psutil
 import logging
+import time
 
 from app.core.config import settings
 from app.core.llm_manager import get_llm_manager
@@ -14,37 +21,156 @@ from app.models.schemas import HealthResponse, ResourceUsage
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Health/resource payloads reused for HEALTH_CACHE_TTL seconds: key -> (monotonic time, value)
+_response_cache: Dict[str, Tuple[float, Any]] = {}
+_response_locks: Dict[str, asyncio.Lock] = {}
 
-@router.get("/health", response_model=HealthResponse)
-async def get_system_health():
-    """Get comprehensive system health status"""
+# Background CPU sampling, so requests read the latest value instead of blocking for one
+CPU_SAMPLE_INTERVAL = 0.5  # seconds
+_last_cpu: Optional[float] = None
+_cpu_sampler_task: Optional[asyncio.Task] = None
+
+
+async def _cpu_sampler():
+    """Refresh _last_cpu every CPU_SAMPLE_INTERVAL (CPU usage since the previous sample)"""
+    global _last_cpu
+    psutil.cpu_percent(interval=None)  # first non-blocking call only sets the baseline
+    while True:
+        await asyncio.sleep(CPU_SAMPLE_INTERVAL)
+        _last_cpu = psutil.cpu_percent(interval=None)
+
+
+def start_cpu_sampler():
+    """Start the background CPU sampler"""
+    global _cpu_sampler_task
+    if _cpu_sampler_task is None:
+        _cpu_sampler_task = asyncio.create_task(_cpu_sampler())
+
+
+async def stop_cpu_sampler():
+    """Stop the background CPU sampler"""
+    global _cpu_sampler_task
+    if _cpu_sampler_task is not None:
+        _cpu_sampler_task.cancel()
+        try:
+            await _cpu_sampler_task
+        except asyncio.CancelledError:
+            pass
+        _cpu_sampler_task = None
+
+
+async def _get_cached(key: str, build: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool, float]:
+    """Return (value, cache hit, age in seconds), building at most once per TTL"""
+    ttl = settings.HEALTH_CACHE_TTL
+    entry = _response_cache.get(key)
+    if entry and time.monotonic() - entry[0] < ttl:
+        return entry[1], True, time.monotonic() - entry[0]
     
-    services = {}
+    # One build per key at a time; concurrent pollers wait for it and share the result
+    async with _response_locks.setdefault(key, asyncio.Lock()):
+        entry = _response_cache.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            return entry[1], True, time.monotonic() - entry[0]
+        
+        value = await build()
+        _response_cache[key] = (time.monotonic(), value)
+        return value, False, 0.0
+
+
+def _set_cache_headers(response: Response, hit: bool, age: float):
+    """Tell clients whether this was cached and how long it stays fresh"""
+    response.headers["X-Cache"] = "HIT" if hit else "MISS"
+    response.headers["Cache-Control"] = f"max-age={max(0, int(settings.HEALTH_CACHE_TTL - age))}"
+
+
+@router.get("/health", response_model=HealthResponse)
+async def get_system_health(response: Response):
+    """Get comprehensive system health status (cached for HEALTH_CACHE_TTL seconds)"""
     
-    # Check LLM service
-    try:
-        llm_manager = get_llm_manager()
-        services["llm"] = "healthy" if llm_manager.current_model else "no_model"
-    except Exception as e:
-        services["llm"] = f"error: {str(e)}"
+    health, hit, age = await _get_cached("health", _collect_system_health)
+    _set_cache_headers(response, hit, age)
+    return health
+
+
+@router.get("/resources", response_model=ResourceUsage)
+async def get_resource_usage(response: Response):
+    """Get detailed resource usage information (cached for HEALTH_CACHE_TTL seconds)"""
     
-    # Check MCP service
-    try:
-        mcp_manager = get_mcp_manager()
-        services["mcp"] = f"healthy ({len(mcp_manager.clients)} servers)"
-    except Exception as e:
-        services["mcp"] = f"error: {str(e)}"
+    resources, hit, age = await _get_cached("resources", _collect_resource_usage)
+    _set_cache_headers(response, hit, age)
+    return resources
+
+
+LOAD_AVG_PERIODS = ("1m", "5m", "15m")
+
+
+def _format_metrics(resources: ResourceUsage) -> str:
+    """Resource usage in the Prometheus text exposition format (all gauges)"""
+    lines = []
+    for section, values in resources.model_dump().items():
+        for key, value in values.items():
+            name = f"oapilot_{section}_{key}"
+            lines.append(f"# TYPE {name} gauge")
+            if isinstance(value, (list, tuple)):
+                # load_avg: one sample per averaging period
+                for period, sample in zip(LOAD_AVG_PERIODS, value):
+                    lines.append(f'{name}{{period="{period}"}} {sample}')
+            else:
+                lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Resource usage for Prometheus scrapers (shares the /resources cache)"""
     
-    # Check storage
-    try:
-        storage_manager = get_storage_manager()
-        storage_info = storage_manager.get_storage_summary()
-        services["storage"] = "healthy"
-    except Exception as e:
-        services["storage"] = f"error: {str(e)}"
+    resources, hit, _ = await _get_cached("resources", _collect_resource_usage)
+    return PlainTextResponse(
+        _format_metrics(resources),
+        media_type="text/plain; version=0.0.4",
+        headers={"X-Cache": "HIT" if hit else "MISS"}
+    )
+
+
+async def _probe_llm() -> str:
+    """Check LLM service"""
+    llm_manager = get_llm_manager()
+    return "healthy" if llm_manager.current_model else "no_model"
+
+
+async def _probe_mcp() -> str:
+    """Check MCP service"""
+    mcp_manager = get_mcp_manager()
+    return f"healthy ({len(mcp_manager.clients)} servers)"
+
+
+async def _probe_storage() -> str:
+    """Check storage (the summary walks the filesystem, so off the event loop)"""
+    storage_manager = get_storage_manager()
+    await run_in_threadpool(storage_manager.get_storage_summary)
+    return "healthy"
+
+
+async def _probe_resources() -> ResourceUsage:
+    """Get resource usage (shares the /resources cache)"""
+    resources, _, _ = await _get_cached("resources", _collect_resource_usage)
+    return resources
+
+
+async def _collect_system_health() -> HealthResponse:
+    """Probe every service concurrently and build the health payload"""
     
-    # Get resource usage
-    resources = await get_resource_usage()
+    # Latency is the slowest probe rather than the sum; a failing probe reports its error
+    llm, mcp, storage, resources = await asyncio.gather(
+        _probe_llm(), _probe_mcp(), _probe_storage(), _probe_resources(),
+        return_exceptions=True
+    )
+    services = {
+        name: f"error: {str(result)}" if isinstance(result, Exception) else result
+        for name, result in (("llm", llm), ("mcp", mcp), ("storage", storage))
+    }
+    if isinstance(resources, Exception):
+        raise resources
     
     return HealthResponse(
         status="healthy" if all("error" not in s for s in services.values()) else "degraded",
@@ -55,12 +181,23 @@ async def get_system_health():
     )
 
 
-@router.get("/resources", response_model=ResourceUsage)
-async def get_resource_usage():
-    """Get detailed resource usage information"""
+async def _collect_resource_usage() -> ResourceUsage:
+    """Measure memory, disk, CPU and storage usage"""
+    
+    # Syscalls and filesystem walks run concurrently in the threadpool, off the event loop
+    storage_manager = get_storage_manager()
+    mem, disk, db_info, artifacts_info = await asyncio.gather(
+        run_in_threadpool(psutil.virtual_memory),
+        run_in_threadpool(psutil.disk_usage, '/'),
+        run_in_threadpool(storage_manager.check_database_size),
+        run_in_threadpool(storage_manager.check_artifacts_size),
+        return_exceptions=True
+    )
+    for result in (mem, disk):
+        if isinstance(result, Exception):
+            raise result
     
     # Memory info
-    mem = psutil.virtual_memory()
     memory = {
         "total_gb": round(mem.total / (1024**3), 2),
         "used_gb": round(mem.used / (1024**3), 2),
@@ -69,7 +206,6 @@ async def get_resource_usage():
     }
     
     # Disk info
-    disk = psutil.disk_usage('/')
     disk_info = {
         "total_gb": round(disk.total / (1024**3), 2),
         "used_gb": round(disk.used / (1024**3), 2),
@@ -79,15 +215,16 @@ async def get_resource_usage():
     
     # CPU info
     cpu = {
-        "percent": round(psutil.cpu_percent(interval=1), 1),
+        # Sampler not started yet: non-blocking reading since the previous call
+        "percent": round(_last_cpu if _last_cpu is not None else psutil.cpu_percent(interval=None), 1),
         "cores": psutil.cpu_count(),
         "load_avg": psutil.getloadavg() if hasattr(psutil, 'getloadavg') else [0, 0, 0]
     }
     
     # Database info
     try:
-        storage_manager = get_storage_manager()
-        db_info = storage_manager.check_database_size()
+        if isinstance(db_info, Exception):
+            raise db_info
         database = {
             "size_mb": db_info["size_mb"],
             "limit_mb": db_info["limit_mb"],
@@ -98,7 +235,8 @@ async def get_resource_usage():
     
     # Artifacts info
     try:
-        artifacts_info = storage_manager.check_artifacts_size()
+        if isinstance(artifacts_info, Exception):
+            raise artifacts_info
         artifacts = {
             "size_gb": artifacts_info["size_gb"],
             "limit_gb": artifacts_info["limit_gb"],
@@ -222,7 +360,8 @@ async def trigger_storage_cleanup():
     try:
         storage_manager = get_storage_manager()
         
-        # Get before stats
+        # Get before stats (measured now, not from the cache)
+        storage_manager.invalidate_summary()
         before_stats = storage_manager.get_storage_summary()
         
         # Run cleanup
@@ -231,6 +370,7 @@ async def trigger_storage_cleanup():
         await storage_manager.cleanup_old_artifacts(days=7)
         
         # Get after stats
+        storage_manager.invalidate_summary()
         after_stats = storage_manager.get_storage_summary()
         
         return {
@@ -259,9 +399,42 @@ async def get_storage_info():
         raise HTTPException(status_code=500, detail=f"Failed to get storage info: {str(e)}")
 
 
+# Serialized /config body and its ETag, built on first request (settings are fixed at startup)
+_config_response: Optional[Tuple[bytes, str]] = None
+
+
+def _get_config_response() -> Tuple[bytes, str]:
+    """Return the (JSON body, ETag) pair for /config"""
+    global _config_response
+    if _config_response is None:
+        body = orjson.dumps(_build_configuration())
+        _config_response = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+    return _config_response
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header (weak comparison, may list several tags) matches"""
+    if if_none_match.strip() == "*":
+        return True
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == etag:
+            return True
+    return False
+
+
 @router.get("/config")
-async def get_configuration():
-    """Get current system configuration"""
+async def get_configuration(request: Request):
+    """Get current system configuration (ETag-validated; 304 when unchanged)"""
+    
+    body, etag = _get_config_response()
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+def _build_configuration() -> dict:
+    """Current system configuration"""
     
     return {
         "llm": {
@@ -290,6 +463,31 @@ async def get_configuration():
     }
 
 
+LOG_TAIL_BLOCK_SIZE = 8192  # bytes read per backward step when tailing the log
+
+
+def _tail_lines(path: str, lines: int) -> List[str]:
+    """Last `lines` lines of a file, reading blocks backward from EOF (blocking)"""
+    if lines <= 0:
+        return []
+    
+    with open(path, "rb") as f:
+        position = f.seek(0, 2)
+        blocks = []
+        newlines = 0
+        # One newline more than requested guarantees the first kept line is complete
+        while position > 0 and newlines <= lines:
+            size = min(LOG_TAIL_BLOCK_SIZE, position)
+            position -= size
+            f.seek(position)
+            block = f.read(size)
+            blocks.append(block)
+            newlines += block.count(b"\n")
+    
+    tail = b"".join(reversed(blocks)).decode("utf-8", errors="replace")
+    return tail.splitlines()[-lines:]
+
+
 @router.get("/logs")
 async def get_recent_logs(lines: int = 100):
     """Get recent application logs"""
@@ -301,13 +499,11 @@ async def get_recent_logs(lines: int = 100):
         if not os.path.exists(log_file):
             return {"logs": [], "message": "No log file found"}
         
-        with open(log_file, "r") as f:
-            all_lines = f.readlines()
-            recent_lines = all_lines[-lines:] if len(all_lines) > lines else all_lines
+        # Only the tail is read, so large logs cost O(lines) rather than O(file size)
+        recent_lines = await run_in_threadpool(_tail_lines, log_file, lines)
         
         return {
             "logs": [line.strip() for line in recent_lines],
-            "total_lines": len(all_lines),
             "returned_lines": len(recent_lines)
         }
         
@@ -5,21 +5,48 @@ without requiring AWS Q to be installed. OAPilot acts as a standalone
 AI assistant that uses the same configuration format as AWS Q for compatibility.
 """
 
-import json
+import orjson
 import os
 import subprocess
 import asyncio
 import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Union
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Tuple, Union
+from dataclasses import dataclass, field
 from enum import Enum
 
 from app.core.config import settings
+from app.core.executors import get_io_pool
 from app.core.mcp_client import MCPClient, MCPManager
 
 logger = logging.getLogger(__name__)
 
+# Slotted dataclasses (no per-instance __dict__) where the runtime supports them
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Parsed server configs keyed on (name, canonical JSON), so reloading an
+# unchanged server reuses its (frozen, shared) config object
+SERVER_CONFIG_CACHE_MAX = 512
+_server_config_cache: "OrderedDict[tuple, AWSQMCPServerConfig]" = OrderedDict()
+_server_config_lock = threading.Lock()  # extract_mcp_servers also runs in worker threads
+
+# Pre-encoded JSON-RPC errors the STDIO bridge synthesizes itself
+_NO_RESPONSE_BYTES = orjson.dumps({"error": {"code": -32000, "message": "No response from server"}})
+_TIMEOUT_BYTES = orjson.dumps({"error": {"code": -32000, "message": "Request timeout"}})
+_INVALID_ID_BYTES = orjson.dumps({"jsonrpc": "2.0", "id": None,
+                                  "error": {"code": -32600, "message": "Invalid Request: id must be a string, number or null"}})
+
+
+def _valid_request_id(request_id: Any) -> bool:
+    """JSON-RPC ids are strings, numbers or null (bool is not a number here)"""
+    return request_id is None or (
+        isinstance(request_id, (str, int, float)) and not isinstance(request_id, bool)
+    )
+
 
 class MCPTransportType(Enum):
     """MCP server transport types supported by AWS Q"""
@@ -27,7 +54,7 @@ class MCPTransportType(Enum):
     HTTP = "http"    # Remote server via HTTP
 
 
-@dataclass
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class AWSQMCPServerConfig:
     """Configuration for an MCP server in AWS Q format"""
     name: str
@@ -48,12 +75,44 @@ class AWSQMCPServerConfig:
     oauth_client_secret: Optional[str] = None
     oauth_redirect_uri: Optional[str] = None
 
+    # Process environment for STDIO servers, built on first start and
+    # cleared on every configuration reload
+    _process_env: Optional[Dict[str, str]] = field(default=None, init=False, repr=False, compare=False)
+
+    def process_env(self) -> Dict[str, str]:
+        """os.environ overlaid with this server's env, reused across restarts until a reload"""
+        if self._process_env is None:
+            env = os.environ.copy()
+            if self.env:
+                env.update(self.env)
+
+            if self.command == "docker":
+                # For Docker containers, ensure unbuffered communication
+                env.update({
+                    "PYTHONUNBUFFERED": "1",
+                    "PYTHONIOENCODING": "utf-8"
+                })
+            # The cache slot is the only field set after construction
+            object.__setattr__(self, "_process_env", env)
+        return self._process_env
+
+    def reset_process_env(self):
+        """Drop the environment snapshot so the next start re-reads os.environ"""
+        object.__setattr__(self, "_process_env", None)
+
     @classmethod
     def from_dict(cls, name: str, config: Dict[str, Any]) -> "AWSQMCPServerConfig":
         """Create from AWS Q configuration dictionary"""
+        key = (name, orjson.dumps(config, option=orjson.OPT_SORT_KEYS))
+        with _server_config_lock:
+            cached = _server_config_cache.get(key)
+            if cached is not None:
+                _server_config_cache.move_to_end(key)
+                return cached
+
         transport_type = MCPTransportType.HTTP if config.get("type") == "http" else MCPTransportType.STDIO
 
-        return cls(
+        server_config = cls(
             name=name,
             transport_type=transport_type,
             command=config.get("command"),
@@ -67,6 +126,19 @@ class AWSQMCPServerConfig:
             oauth_redirect_uri=config.get("oauthRedirectUri")
         )
 
+        with _server_config_lock:
+            _server_config_cache[key] = server_config
+            while len(_server_config_cache) > SERVER_CONFIG_CACHE_MAX:
+                _server_config_cache.popitem(last=False)
+        return server_config
+
+
+def reset_process_envs():
+    """Drop the environment snapshots of all cached server configs"""
+    with _server_config_lock:
+        for server_config in _server_config_cache.values():
+            server_config.reset_process_env()
+
 
 class AWSQConfigLoader:
     """Load and parse AWS Q MCP configuration files"""
@@ -77,6 +149,38 @@ class AWSQConfigLoader:
     PROJECT_CLI_PATH = Path(".amazonq") / "cli-agents"
     PROJECT_IDE_PATH = Path(".amazonq") / "agents"
 
+    # Agent config keys OAPilot reads; prompts, tools, hooks etc. are not kept
+    CONFIG_FIELDS = ("name", "description", "mcpServers")
+
+    # Directory listings keyed on the directory's mtime, which changes whenever
+    # an entry is added, removed or renamed
+    _scan_cache: Dict[Path, Tuple[int, List[Path]]] = {}
+    SCAN_CACHE_MIN_AGE_NS = 2_000_000_000  # don't trust an mtime this recent (coarse fs clocks)
+
+    @classmethod
+    def _scan_json_files(cls, directory: Path) -> List[Path]:
+        """List *.json files directly inside a directory using cached dirent types"""
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+            cached = cls._scan_cache.get(directory)
+            if cached is not None and cached[0] == mtime_ns:
+                return list(cached[1])
+
+            with os.scandir(directory) as entries:
+                files = [
+                    directory / entry.name
+                    for entry in entries
+                    if entry.name.endswith(".json") and entry.is_file()
+                ]
+        except (FileNotFoundError, NotADirectoryError):
+            cls._scan_cache.pop(directory, None)
+            return []
+
+        # A change within the same clock tick would leave the mtime unchanged
+        if time.time_ns() - mtime_ns > cls.SCAN_CACHE_MIN_AGE_NS:
+            cls._scan_cache[directory] = (mtime_ns, files)
+        return list(files)
+
     @classmethod
     def find_config_files(cls, project_root: Optional[Path] = None) -> List[Path]:
         """Find all AWS Q MCP configuration files"""
@@ -84,16 +188,13 @@ class AWSQConfigLoader:
 
         # Check global locations
         for base_path in [cls.GLOBAL_CLI_PATH, cls.GLOBAL_IDE_PATH]:
-            if base_path.exists():
-                config_files.extend(base_path.glob("*.json"))
+            config_files.extend(cls._scan_json_files(base_path))
 
         # Check project-specific locations if provided
         if project_root:
             project_root = Path(project_root)
             for rel_path in [cls.PROJECT_CLI_PATH, cls.PROJECT_IDE_PATH]:
-                project_path = project_root / rel_path
-                if project_path.exists():
-                    config_files.extend(project_path.glob("*.json"))
+                config_files.extend(cls._scan_json_files(project_root / rel_path))
 
         # Also check for legacy mcp.json files
         legacy_paths = [
@@ -110,15 +211,15 @@ class AWSQConfigLoader:
     def load_configuration(cls, config_file: Path) -> Dict[str, Any]:
         """Load an AWS Q agent configuration file"""
         try:
-            with open(config_file, 'r') as f:
-                config = json.load(f)
+            with open(config_file, 'rb') as f:
+                config = orjson.loads(f.read())
 
             # Validate required fields
             if not config.get("name"):
                 logger.warning(f"Configuration {config_file} missing 'name' field")
                 return None
 
-            return config
+            return {key: config[key] for key in cls.CONFIG_FIELDS if key in config}
         except Exception as e:
             logger.error(f"Failed to load configuration {config_file}: {e}")
             return None
@@ -149,6 +250,11 @@ class STDIOBridge:
         self.process = None
         self.bridge_port = None
         self.bridge_server = None
+        self._pending: Dict[Any, asyncio.Future] = {}  # JSON-RPC id -> waiting request
+        self._next_id = 0
+        self._write_queue: asyncio.Queue = asyncio.Queue()  # framed messages waiting for stdin
+        self._writer_task: Optional[asyncio.Task] = None
+        self._reader_task: Optional[asyncio.Task] = None
 
     async def start(self) -> str:
         """Start the STDIO process and create HTTP bridge
@@ -156,29 +262,15 @@ class STDIOBridge:
         Returns the HTTP endpoint URL for the bridge
         """
         try:
-            # Prepare environment
-            env = os.environ.copy()
-            if self.config.env:
-                env.update(self.config.env)
-
             # Start the MCP server process
             cmd = [self.config.command] + (self.config.args or [])
 
-            # Check if this is a Docker command and modify environment
-            is_docker = self.config.command == "docker"
-            if is_docker:
-                # For Docker containers, ensure unbuffered communication
-                env.update({
-                    "PYTHONUNBUFFERED": "1",
-                    "PYTHONIOENCODING": "utf-8"
-                })
-
             self.process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdin=asyncio.subprocess.PIPE,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                env=env
+                env=self.config.process_env()
             )
 
             # Wait a moment to see if the process starts successfully
@@ -189,11 +281,9 @@ class STDIOBridge:
                 error_msg = stderr_data.decode() if stderr_data else "Process exited immediately"
                 raise Exception(f"MCP server failed to start: {error_msg}")
 
-            # Find an available port for the bridge
-            import socket
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                s.bind(('', 0))
-                self.bridge_port = s.getsockname()[1]
+            # Route stdout messages to waiting requests
+            self._reader_task = asyncio.create_task(self._read_loop())
+            self._writer_task = asyncio.create_task(self._write_loop())
 
             # Start HTTP-to-STDIO bridge server
             from aiohttp import web
@@ -202,95 +292,70 @@ class STDIOBridge:
 
             runner = web.AppRunner(app)
             await runner.setup()
-            site = web.TCPSite(runner, 'localhost', self.bridge_port)
+            # Port 0: the OS picks a free port atomically at bind time. A single
+            # IPv4 address, since 'localhost' could bind each family to a different port
+            site = web.TCPSite(runner, '127.0.0.1', 0)
             await site.start()
             self.bridge_server = runner
+            self.bridge_port = runner.addresses[0][1]
 
             logger.info(f"Started STDIO bridge for {self.config.name} on port {self.bridge_port}")
-            return f"http://localhost:{self.bridge_port}"
+            return f"http://127.0.0.1:{self.bridge_port}"
 
         except Exception as e:
             logger.error(f"Failed to start STDIO bridge for {self.config.name}: {e}")
             raise
 
     async def _handle_request(self, request):
-        """Handle HTTP requests and forward to STDIO process"""
+        """Handle HTTP requests and forward to STDIO process
+        
+        Requests are pipelined: each waits on a future that the stdout reader
+        resolves by JSON-RPC id, so concurrent callers share the process. An
+        array batch is fanned out the same way and answered with an array.
+        """
         from aiohttp import web
 
         try:
-            # Read JSON-RPC request
-            data = await request.json()
-
-            # Send to process stdin
-            request_data = json.dumps(data) + '\n'
-            self.process.stdin.write(request_data.encode('utf-8'))
-            await self.process.stdin.drain()
-
-            # For Docker containers, ensure flush
-            if hasattr(self.process.stdin, 'flush'):
-                self.process.stdin.flush()
-
-            # Read response from stdout with better handling
-            response_data = ""
-            timeout_seconds = self.config.timeout / 1000.0
-
-            # Try to read a complete JSON response
-            max_attempts = 10  # Prevent infinite loops
-            attempts = 0
-
-            while attempts < max_attempts:
-                try:
-                    response_line = await asyncio.wait_for(
-                        self.process.stdout.readline(),
-                        timeout=timeout_seconds
-                    )
-
-                    if not response_line:
-                        break
-
-                    line_text = response_line.decode('utf-8').strip()
-                    if not line_text:
-                        continue
-
-                    # For Docker containers, handle potential multi-line JSON
-                    if line_text.startswith('{') or response_data:
-                        response_data += line_text
-
-                    # Try to parse as JSON - if successful, we have a complete response
-                    try:
-                        response = json.loads(response_data)
-                        logger.debug(f"Received response from {self.config.name}: {response}")
-                        return web.json_response(response)
-                    except json.JSONDecodeError:
-                        # Not complete JSON yet, continue reading
-                        # But only if we have some data that looks like JSON start
-                        if not response_data.strip().startswith('{'):
-                            response_data = ""  # Reset if not JSON
-                        attempts += 1
-                        continue
-
-                except asyncio.TimeoutError:
-                    logger.warning(f"Timeout reading from {self.config.name} after {timeout_seconds}s")
-                    break
-
-            # If we get here, we didn't get valid JSON
-            if response_data:
-                logger.error(f"Invalid JSON from MCP server {self.config.name}: {response_data}")
+            request_data = await request.read()
+            data = orjson.loads(request_data)
+            if not isinstance(data, (dict, list)) or data == []:
                 return web.json_response(
-                    {"error": {"code": -32700, "message": f"Parse error: {response_data}"}},
-                    status=500
+                    {"error": {"code": -32600, "message": "Invalid Request: expected a JSON-RPC object or batch"}},
+                    status=400
                 )
-            else:
+
+            if self._reader_task is None or self._reader_task.done() or self._writer_task.done():
+                logger.error(f"No response from MCP server {self.config.name}: pipe closed")
+                return web.Response(body=_NO_RESPONSE_BYTES, status=504, content_type='application/json')
+
+            if isinstance(data, list):
+                responses = await asyncio.gather(*(self._call_batch_item(item) for item in data))
+                responses = [response for response in responses if response is not None]
+                if not responses:
+                    # A batch of only notifications gets no response
+                    return web.Response(status=202)
+                return web.Response(body=b'[' + b','.join(responses) + b']', content_type='application/json')
+
+            # Notifications get no response
+            if "id" not in data:
+                self._write(request_data)
+                return web.Response(status=202)
+            if not _valid_request_id(data["id"]):
+                return web.Response(body=_INVALID_ID_BYTES, status=400, content_type='application/json')
+
+            response_data = await self._call(data, request_data)
+            if response_data is None:
                 logger.error(f"No response from MCP server {self.config.name}")
-                return web.json_response(
-                    {"error": {"code": -32000, "message": "No response from server"}},
-                    status=504
-                )
+                return web.Response(body=_NO_RESPONSE_BYTES, status=504, content_type='application/json')
+            return web.Response(body=response_data, content_type='application/json')
 
         except asyncio.TimeoutError:
+            logger.warning(f"Timeout waiting for {self.config.name} after {self.config.timeout}ms")
+            return web.Response(body=_TIMEOUT_BYTES, status=504, content_type='application/json')
+        except orjson.JSONDecodeError as e:
             return web.json_response(
-                {"error": {"code": -32000, "message": "Request timeout"}},
-                status=504
+                {"error": {"code": -32700, "message": f"Parse error: {e}"}},
+                status=400
             )
         except Exception as e:
             logger.error(f"Bridge request error: {e}")
@@ -299,6 +364,139 @@ class STDIOBridge:
                 status=500
             )
 
+    async def _call(self, data: Dict[str, Any], request_data: bytes) -> Optional[bytes]:
+        """Forward one request and wait for its response bytes; None if the server closed
+        
+        Raises asyncio.TimeoutError after the configured timeout.
+        """
+        # Keep the caller's id unless another in-flight request already uses it
+        client_id = data["id"]
+        key = client_id
+        remapped = key is None or key in self._pending
+        if remapped:
+            self._next_id += 1
+            key = f"oapilot-bridge-{self._next_id}"
+            data["id"] = key
+            request_data = orjson.dumps(data)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            self._write(request_data)
+            response = await asyncio.wait_for(future, timeout=self.config.timeout / 1000.0)
+        finally:
+            self._pending.pop(key, None)
+
+        if response is None:
+            return None
+
+        response_data, message = response
+        if remapped:
+            # Restore the caller's id on a remapped request
+            message["id"] = client_id
+            response_data = orjson.dumps(message)
+        return response_data
+
+    async def _call_batch_item(self, item: Any) -> Optional[bytes]:
+        """Forward one element of a batch; its response (or error) bytes, None for a notification"""
+        if not isinstance(item, dict):
+            return orjson.dumps({"jsonrpc": "2.0", "id": None,
+                                 "error": {"code": -32600, "message": "Invalid Request"}})
+
+        if "id" not in item:
+            self._write(orjson.dumps(item))
+            return None
+        if not _valid_request_id(item["id"]):
+            return _INVALID_ID_BYTES
+
+        client_id = item["id"]
+        try:
+            response_data = await self._call(item, orjson.dumps(item))
+        except asyncio.TimeoutError:
+            logger.warning(f"Timeout waiting for {self.config.name} after {self.config.timeout}ms")
+            return orjson.dumps({"jsonrpc": "2.0", "id": client_id,
+                                 "error": {"code": -32000, "message": "Request timeout"}})
+
+        if response_data is None:
+            logger.error(f"No response from MCP server {self.config.name}")
+            return orjson.dumps({"jsonrpc": "2.0", "id": client_id,
+                                 "error": {"code": -32000, "message": "No response from server"}})
+        return response_data
+
+    def _write(self, request_data: bytes):
+        """Queue one message for the process stdin"""
+        request_data = request_data.strip()
+        if b'\n' in request_data:
+            # Pretty-printed request: compact it to keep one message per line
+            request_data = orjson.dumps(orjson.loads(request_data))
+
+        self._write_queue.put_nowait(request_data + b'\n')
+
+    async def _write_loop(self):
+        """Write queued messages to stdin, coalescing a burst into one write and drain"""
+        try:
+            while True:
+                batch = [await self._write_queue.get()]
+                while not self._write_queue.empty():
+                    batch.append(self._write_queue.get_nowait())
+
+                self.process.stdin.write(b''.join(batch))
+                await self.process.stdin.drain()
+        except Exception as e:
+            logger.error(f"STDIO bridge writer for {self.config.name} failed: {e}")
+            self._fail_pending()
+
+    async def _read_loop(self):
+        """Read responses from stdout and hand each to the request with its id"""
+        response_data = b""
+        lines = 0
+        max_lines = 10  # a multi-line message longer than this is dropped
+
+        try:
+            while True:
+                response_line = await self.process.stdout.readline()
+                if not response_line:
+                    break
+
+                line = response_line.strip()
+                if not line:
+                    continue
+
+                # For Docker containers, handle potential multi-line JSON;
+                # anything else outside a message is log noise
+                if not (line.startswith(b'{') or response_data):
+                    continue
+                response_data += line
+                lines += 1
+
+                try:
+                    message = orjson.loads(response_data)
+                except orjson.JSONDecodeError:
+                    # Not complete JSON yet, continue reading
+                    if lines >= max_lines:
+                        logger.error(f"Invalid JSON from MCP server {self.config.name}: "
+                                     f"{response_data.decode('utf-8', errors='replace')}")
+                        response_data, lines = b"", 0
+                    continue
+
+                future = self._pending.get(message.get("id")) if isinstance(message, dict) else None
+                if future is not None and not future.done():
+                    future.set_result((response_data, message))
+                else:
+                    logger.debug(f"Dropping unmatched message from {self.config.name}")
+                response_data, lines = b"", 0
+        except Exception as e:
+            logger.error(f"STDIO bridge reader for {self.config.name} failed: {e}")
+        finally:
+            self._fail_pending()
+
+    def _fail_pending(self):
+        """Resolve all waiting requests with no response"""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result(None)
+        self._pending.clear()
+
     async def stop(self):
         """Stop the STDIO process and bridge"""
         if self.process:
@@ -317,6 +515,14 @@ class STDIOBridge:
             except Exception as e:
                 logger.warning(f"Error stopping STDIO bridge process: {e}")
 
+        for task in (self._reader_task, self._writer_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._reader_task = None
+        self._writer_task = None
+        self._fail_pending()
+
         if self.bridge_server:
             try:
                 await self.bridge_server.cleanup()
@@ -337,58 +543,76 @@ class AWSQMCPManager(MCPManager):
 
         Returns list of loaded server names
         """
-        loaded_servers = []
+        # Reused config objects must not keep a stale os.environ snapshot
+        reset_process_envs()
 
         # Find all configuration files
         config_files = AWSQConfigLoader.find_config_files(project_root)
         logger.info(f"Found {len(config_files)} AWS Q configuration files")
 
-        for config_file in config_files:
-            # Load the configuration
-            config = AWSQConfigLoader.load_configuration(config_file)
+        # Read and parse the files in parallel off the event loop
+        loop = asyncio.get_running_loop()
+        io_pool = get_io_pool()
+        configs = await asyncio.gather(*(
+            loop.run_in_executor(io_pool, AWSQConfigLoader.load_configuration, config_file)
+            for config_file in config_files
+        ))
+
+        # Extract MCP servers; the first file defining a name wins
+        servers: Dict[str, Tuple[Path, AWSQMCPServerConfig]] = {}
+        for config_file, config in zip(config_files, configs):
             if not config:
                 continue
+            for server_name, server_config in AWSQConfigLoader.extract_mcp_servers(config).items():
+                if server_name in servers:
+                    logger.warning(f"MCP server '{server_name}' in {config_file} already defined, skipping")
+                    continue
+                servers[server_name] = (config_file, server_config)
+
+        # Start bridges and connect to all servers concurrently
+        results = await asyncio.gather(*(
+            self._load_awsq_server(server_name, server_config, config_file)
+            for server_name, (config_file, server_config) in servers.items()
+        ))
+
+        return [server_name for server_name, success in zip(servers, results) if success]
+
+    async def _load_awsq_server(self, server_name: str, server_config: AWSQMCPServerConfig,
+                                config_file: Path) -> bool:
+        """Initialize one configured MCP server; errors are logged, not raised"""
+        try:
+            # Store the configuration
+            self.awsq_configs[server_name] = server_config
+
+            # Initialize based on transport type
+            success = False
+            if server_config.transport_type == MCPTransportType.HTTP:
+                # Direct HTTP connection
+                success = await self.add_server(
+                    server_name,
+                    server_config.url,
+                    server_name
+                )
 
-            # Extract MCP servers
-            mcp_servers = AWSQConfigLoader.extract_mcp_servers(config)
+            elif server_config.transport_type == MCPTransportType.STDIO:
+                # Create STDIO bridge
+                bridge = STDIOBridge(server_config)
+                endpoint = await bridge.start()
+                self.stdio_bridges[server_name] = bridge
+
+                # Connect via bridge endpoint
+                success = await self.add_server(
+                    server_name,
+                    endpoint,
+                    server_name
+                )
 
-            for server_name, server_config in mcp_servers.items():
-                try:
-                    # Store the configuration
-                    self.awsq_configs[server_name] = server_config
-
-                    # Initialize based on transport type
-                    if server_config.transport_type == MCPTransportType.HTTP:
-                        # Direct HTTP connection
-                        success = await self.add_server(
-                            server_name,
-                            server_config.url,
-                            server_name
-                        )
-                        if success:
-                            loaded_servers.append(server_name)
-
-                    elif server_config.transport_type == MCPTransportType.STDIO:
-                        # Create STDIO bridge
-                        bridge = STDIOBridge(server_config)
-                        endpoint = await bridge.start()
-                        self.stdio_bridges[server_name] = bridge
-
-                        # Connect via bridge endpoint
-                        success = await self.add_server(
-                            server_name,
-                            endpoint,
-                            server_name
-                        )
-                        if success:
-                            loaded_servers.append(server_name)
-
-                    logger.info(f"Loaded MCP server '{server_name}' from {config_file}")
-
-                except Exception as e:
-                    logger.error(f"Failed to load MCP server '{server_name}': {e}")
-
-        return loaded_servers
+            logger.info(f"Loaded MCP server '{server_name}' from {config_file}")
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to load MCP server '{server_name}': {e}")
+            return False
 
     async def shutdown(self):
         """Shutdown all connections and bridges"""
@@ -0,0 +1,80 @@
+"""Response compression that leaves already-compressed and zero-copy bodies alone"""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Content types whose payload is already compressed; gzip would only burn CPU
+_PRECOMPRESSED_PREFIXES = ("image/", "video/", "audio/", "font/woff")
+_PRECOMPRESSED_TYPES = {
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/x-7z-compressed",
+    "application/x-bzip2",
+    "application/x-xz",
+    "application/zstd",
+    "application/pdf",
+    "application/octet-stream",
+}
+# SVG is text and compresses well despite the image/ prefix
+_COMPRESSIBLE_EXCEPTIONS = {"image/svg+xml"}
+# Event streams must reach the client per event; gzip would hold them in its buffer
+_STREAMING_TYPES = {"text/event-stream"}
+
+
+def is_precompressed(content_type: str) -> bool:
+    """Whether a response with this Content-Type should be sent uncompressed"""
+    media_type = content_type.split(";", 1)[0].strip().lower()
+    if media_type in _COMPRESSIBLE_EXCEPTIONS:
+        return False
+    if media_type in _STREAMING_TYPES:
+        return True
+    return media_type in _PRECOMPRESSED_TYPES or media_type.startswith(_PRECOMPRESSED_PREFIXES)
+
+
+class _SelectiveGZipResponder(GZipResponder):
+    """GZipResponder that passes through precompressed and zero-copy responses"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.passthrough = False
+    
+    async def send_with_gzip(self, message: Message) -> None:
+        message_type = message["type"]
+        
+        if message_type == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            if is_precompressed(headers.get("content-type", "")):
+                self.passthrough = True
+                self.started = True
+                await self.send(message)
+                return
+        elif self.passthrough:
+            await self.send(message)
+            return
+        elif message_type == "http.response.zerocopysend":
+            # The file goes straight from the kernel, so it cannot be compressed
+            if not self.started:
+                self.started = True
+                await self.send(self.initial_message)
+            self.passthrough = True
+            await self.send(message)
+            return
+        
+        await super().send_with_gzip(message)
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips precompressed media types and zero-copy file sends"""
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "gzip" in headers.get("Accept-Encoding", ""):
+                responder = _SelectiveGZipResponder(
+                    self.app, self.minimum_size, compresslevel=self.compresslevel
+                )
+                await responder(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
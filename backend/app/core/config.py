@@ -17,6 +17,7 @@ class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./storage/database/oapilot.db"
     DB_CONNECTION_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10  # extra connections allowed beyond the pool under bursts
     DB_ENABLE_WAL: bool = True
     DB_CACHE_SIZE_KB: int = 64
     
@@ -34,23 +35,40 @@ class Settings(BaseSettings):
     LLM_USE_MLOCK: bool = False
     LLM_BATCH_SIZE: int = 8
     OLLAMA_HOST: str = "http://localhost:11434"
+    LLM_WORKERS: int = 2  # generation jobs run concurrently
+    LLM_QUEUE_SIZE: int = 64  # pending generation jobs before requests get 503
+    
+    # Executor Pools
+    IO_POOL_SIZE: int = 8
+    CPU_POOL_SIZE: int = 2
     
     # MCP Connection Limits
     MAX_MCP_CONNECTIONS: int = 3
     MCP_TIMEOUT_SECONDS: int = 30
     MCP_RESPONSE_SIZE_LIMIT_MB: int = 10
     MCP_AUTO_DISCOVER: bool = True
+    MCP_DISCOVERY_TTL: int = 10  # seconds to reuse Docker discovery results
+    MCP_HTTP2: bool = False  # use HTTP/2 (httpx) for https:// MCP endpoints
     
     # Storage Management
     ARTIFACT_RETENTION_DAYS: int = 30
     SESSION_RETENTION_DAYS: int = 90
     AUTO_CLEANUP_ENABLED: bool = True
     STORAGE_PATH: str = "./storage"
+    # Behind nginx: hand artifact downloads to an `internal;` location aliased
+    # to the artifacts directory via X-Accel-Redirect
+    USE_X_ACCEL: bool = False
+    X_ACCEL_PREFIX: str = "/_internal_artifacts"
     
     # API Limits
     MAX_REQUEST_SIZE_MB: int = 10
+    GZIP_MIN_SIZE: int = 1024  # bytes; smaller responses are sent uncompressed
+    GZIP_LEVEL: int = 5
+    HEALTH_CACHE_TTL: int = 5  # seconds /health and /resources responses are reused
     PAGINATION_LIMIT: int = 20
     RATE_LIMIT_PER_MINUTE: int = 30
+    QUERY_TTL_SECONDS: int = 3600  # direct query state/results are dropped after this
+    QUERY_CACHE_MAX: int = 1024  # most recently used query results kept in memory
     
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
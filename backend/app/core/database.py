@@ -1,61 +1,149 @@
 """Database configuration and session management"""
 
-from sqlalchemy import create_engine, event
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import create_engine, event, text, LargeBinary
+from sqlalchemy.orm import DeclarativeBase, sessionmaker, Session
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.types import TypeDecorator
 from typing import Generator
+import asyncio
 import logging
+import orjson
+import os
+import time
+import uuid
 
 from app.core.config import settings
+from app.core.executors import get_io_pool
 
 logger = logging.getLogger(__name__)
 
-# Create base class for models
-Base = declarative_base()
+# Schema version recorded in PRAGMA user_version once data migrations have run.
+# Bump it whenever models or _upgrade_schema change, so existing databases rerun them.
+SCHEMA_VERSION = 4
+
+# Secondary indexes older models created on integer primary keys
+LEGACY_PK_INDEXES = (
+    "ix_chat_sessions_id",
+    "ix_chat_messages_id",
+    "ix_artifacts_id",
+    "ix_mcp_servers_id",
+)
+
+# (table, column) pairs stored as UUIDBinary
+UUID_COLUMNS = [
+    ("chat_sessions", "session_id"),
+    ("chat_messages", "message_id"),
+    ("chat_messages", "session_id"),
+    ("artifacts", "artifact_id"),
+    ("artifacts", "session_id"),
+    ("artifacts", "message_id"),
+]
+
+
+class Base(DeclarativeBase):
+    """Base class for models"""
+
+
+class UUIDBinary(TypeDecorator):
+    """UUID stored as a 16-byte BLOB, exposed to Python as the canonical string
+    
+    Values that are not valid UUIDs are stored as their UTF-8 bytes, so lookups
+    with arbitrary client-supplied IDs still just find nothing.
+    """
+    impl = LargeBinary(16)
+    cache_ok = True
+    
+    def process_bind_param(self, value, dialect):
+        if value is None or isinstance(value, bytes):
+            return value
+        if isinstance(value, uuid.UUID):
+            return value.bytes
+        value = str(value)
+        try:
+            return uuid.UUID(value).bytes
+        except ValueError:
+            return value.encode("utf-8")
+    
+    def process_result_value(self, value, dialect):
+        if isinstance(value, bytes):
+            if len(value) == 16:
+                return str(uuid.UUID(bytes=value))
+            return value.decode("utf-8")
+        return value
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (RFC 9562 version 7): 48-bit Unix ms timestamp, then random bits
+    
+    Stored as UUIDBinary, new IDs sort after older ones, so inserts append
+    to the end of the ID index instead of landing on random pages.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def _json_serializer(value) -> str:
+    """orjson-backed serializer for JSON columns (SQLAlchemy expects str)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _build_pragma_script() -> str:
+    """Connection pragmas, joined into one script for executescript()"""
+    pragmas = []
+    
+    # Enable Write-Ahead Logging for better concurrency and less memory
+    if settings.DB_ENABLE_WAL:
+        pragmas.append("PRAGMA journal_mode=WAL")
+        # Keep the WAL file from growing unbounded between checkpoints
+        pragmas.append("PRAGMA journal_size_limit=67108864")
+    
+    pragmas += [
+        # Set cache size (negative value is in KiB, independent of page size)
+        f"PRAGMA cache_size=-{settings.DB_CACHE_SIZE_KB}",
+        # Memory-map the database file up to its size limit so reads skip the page cache copy
+        f"PRAGMA mmap_size={settings.MAX_DB_SIZE_MB * 1024 * 1024}",
+        # Use memory for temp tables
+        "PRAGMA temp_store=MEMORY",
+        # Synchronous mode - NORMAL is faster with slight risk
+        "PRAGMA synchronous=NORMAL",
+        # Wait on locks instead of failing immediately with "database is locked"
+        "PRAGMA busy_timeout=5000",
+        # Enable foreign keys
+        "PRAGMA foreign_keys=ON",
+    ]
+    # PRAGMA optimize runs with vacuum_database() rather than on every connect
+    return ";\n".join(pragmas) + ";"
+
+
+_PRAGMA_SCRIPT = _build_pragma_script()
 
 
 def create_optimized_engine():
     """Create SQLite engine with optimizations for low memory usage"""
     
-    # Create engine with single connection pool to minimize memory
+    # Small connection pool: with WAL, readers run concurrently instead of
+    # queueing behind one shared connection (SQLite still serializes writers)
     engine = create_engine(
         settings.DATABASE_URL,
         connect_args={
             "check_same_thread": False,
             "timeout": 15,
         },
-        poolclass=StaticPool,  # Single connection, no pooling overhead
+        poolclass=QueuePool,
+        pool_size=settings.DB_CONNECTION_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
         echo=settings.DEBUG,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
     )
     
     # Configure SQLite for efficiency
     @event.listens_for(engine, "connect")
     def set_sqlite_pragma(dbapi_conn, connection_record):
-        cursor = dbapi_conn.cursor()
-        
-        # Enable Write-Ahead Logging for better concurrency and less memory
-        if settings.DB_ENABLE_WAL:
-            cursor.execute("PRAGMA journal_mode=WAL")
-        
-        # Set cache size (in KB)
-        cache_pages = settings.DB_CACHE_SIZE_KB // 4  # SQLite page size is usually 4KB
-        cursor.execute(f"PRAGMA cache_size={cache_pages}")
-        
-        # Use memory for temp tables
-        cursor.execute("PRAGMA temp_store=MEMORY")
-        
-        # Synchronous mode - NORMAL is faster with slight risk
-        cursor.execute("PRAGMA synchronous=NORMAL")
-        
-        # Enable foreign keys
-        cursor.execute("PRAGMA foreign_keys=ON")
-        
-        # Optimize database periodically
-        cursor.execute("PRAGMA optimize")
-        
-        cursor.close()
-        
+        # Applied as a single script: one call instead of one execute per pragma
+        dbapi_conn.executescript(_PRAGMA_SCRIPT)
         logger.debug("SQLite pragmas set for optimized performance")
     
     return engine
@@ -81,10 +169,81 @@ def init_db():
     import app.models.artifact
     import app.models.mcp
     
+    # user_version doubles as the "initialized" marker: a current database
+    # skips create_all's per-table existence checks on warm starts
+    with engine.connect() as conn:
+        version = conn.execute(text("PRAGMA user_version")).scalar()
+    if version >= SCHEMA_VERSION:
+        logger.info("Database schema up to date")
+        return
+    
     Base.metadata.create_all(bind=engine)
+    _upgrade_schema()
     logger.info("Database initialized successfully")
 
 
+def _upgrade_schema():
+    """Bring databases created by older versions up to the current schema"""
+    with engine.begin() as conn:
+        columns = {row[1] for row in conn.execute(text("PRAGMA table_info(chat_messages)"))}
+        
+        # tokens_used JSON blob -> prompt/response/total integer columns
+        if "prompt_tokens" not in columns:
+            for column in ("prompt_tokens", "response_tokens", "total_tokens"):
+                conn.execute(text(f"ALTER TABLE chat_messages ADD COLUMN {column} INTEGER"))
+            if "tokens_used" in columns:
+                conn.execute(text("""
+                    UPDATE chat_messages SET
+                        prompt_tokens = json_extract(tokens_used, '$.prompt'),
+                        response_tokens = json_extract(tokens_used, '$.response'),
+                        total_tokens = json_extract(tokens_used, '$.total')
+                    WHERE tokens_used IS NOT NULL AND tokens_used != 'null'
+                """))
+            logger.info("Migrated chat_messages token usage to integer columns")
+        
+        # Indexes added to existing tables (create_all only indexes new tables)
+        created_index = False
+        for table in Base.metadata.sorted_tables:
+            existing = {row[1] for row in conn.execute(text(f"PRAGMA index_list({table.name})"))}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn, checkfirst=True)
+                    created_index = True
+        if created_index:
+            # Refresh planner statistics so the new indexes get picked
+            conn.execute(text("ANALYZE"))
+            logger.info("Created missing indexes and analyzed database")
+        
+        version = conn.execute(text("PRAGMA user_version")).scalar()
+        
+        # Text UUIDs -> 16-byte BLOBs; foreign keys are checked once at commit
+        if version < 1:
+            conn.execute(text("PRAGMA defer_foreign_keys=ON"))
+            for table, column in UUID_COLUMNS:
+                rows = conn.execute(text(
+                    f"SELECT rowid, {column} FROM {table} WHERE typeof({column}) = 'text'"
+                )).fetchall()
+                for rowid, value in rows:
+                    try:
+                        packed = uuid.UUID(value).bytes
+                    except ValueError:
+                        continue
+                    conn.execute(
+                        text(f"UPDATE {table} SET {column} = :value WHERE rowid = :rowid"),
+                        {"value": packed, "rowid": rowid}
+                    )
+            logger.info("Migrated UUID columns to binary storage")
+        
+        # Older models put a redundant secondary index on every integer primary key
+        if version < 4:
+            for index_name in LEGACY_PK_INDEXES:
+                conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            logger.info("Dropped redundant primary key indexes")
+        
+        if version < SCHEMA_VERSION:
+            conn.execute(text(f"PRAGMA user_version={SCHEMA_VERSION}"))
+
+
 def check_db_size() -> dict:
     """Check database file size"""
     import os
@@ -105,9 +264,17 @@ def check_db_size() -> dict:
     return {"size_mb": 0, "max_size_mb": settings.MAX_DB_SIZE_MB, "usage_percent": 0}
 
 
+def _vacuum():
+    """Run VACUUM and PRAGMA optimize (blocking)"""
+    # VACUUM cannot run inside a transaction, so use an autocommit connection
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.exec_driver_sql("VACUUM")
+        # Refresh query planner statistics (moved here from connection setup)
+        conn.exec_driver_sql("PRAGMA optimize")
+
+
 async def vacuum_database():
-    """Vacuum database to reclaim space"""
-    with engine.connect() as conn:
-        conn.execute("VACUUM")
-        conn.commit()
-    logger.info("Database vacuumed successfully")
\ No newline at end of file
+    """Vacuum database to reclaim space without blocking the event loop"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(get_io_pool(), _vacuum)
+    logger.info("Database vacuumed successfully")
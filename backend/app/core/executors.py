@@ -0,0 +1,49 @@
+"""Executor pools for blocking work: threads for I/O, processes for CPU"""
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Optional
+import logging
+import sys
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Pools are created on first use so importing this module costs nothing
+_io_pool: Optional[ThreadPoolExecutor] = None
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_io_pool() -> ThreadPoolExecutor:
+    """Get or create the thread pool for blocking file and SQLite I/O"""
+    global _io_pool
+    if _io_pool is None:
+        _io_pool = ThreadPoolExecutor(
+            max_workers=settings.IO_POOL_SIZE,
+            thread_name_prefix="oapilot-io"
+        )
+    return _io_pool
+
+
+def get_cpu_pool() -> ProcessPoolExecutor:
+    """Get or create the process pool for CPU-bound Python work"""
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(max_workers=settings.CPU_POOL_SIZE)
+    return _cpu_pool
+
+
+def shutdown_executors():
+    """Shut down both pools (called on application shutdown)"""
+    global _io_pool, _cpu_pool
+    if _io_pool is not None:
+        _io_pool.shutdown(wait=True)
+        _io_pool = None
+    if _cpu_pool is not None:
+        if sys.version_info >= (3, 9):
+            # Drop queued CPU jobs nobody will await any more
+            _cpu_pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            _cpu_pool.shutdown(wait=True)
+        _cpu_pool = None
+    logger.info("Executor pools shut down")
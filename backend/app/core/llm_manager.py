@@ -1,10 +1,14 @@
 """Memory-optimized LLM manager using Ollama"""
 
+import asyncio
+import functools
 import ollama
-from typing import Optional, Dict, Generator, List, Any
+import httpx
+from typing import Optional, Dict, Generator, AsyncGenerator, List, Any, Set, Tuple
 import psutil
 import gc
 import logging
+import threading
 import time
 from datetime import datetime
 
@@ -40,11 +44,36 @@ class OptimizedLLMManager:
         }
     }
     
+    SYSTEM_PROMPT = (
+        "You are OAPilot, an AI assistant with access to organizational tools through MCP servers. "
+        "Provide helpful, accurate, and concise responses."
+    )
+    
+    # Run a young-generation collection every N generations instead of a full GC per call
+    GC_INTERVAL = 64
+    
+    # Seconds to reuse the Ollama model list before asking again
+    MODELS_CACHE_TTL = 5.0
+    
+    # Seconds to reuse a memory reading; pressure doesn't change meaningfully faster
+    MEMORY_CACHE_TTL = 0.5
+    
     def __init__(self):
         self.current_model = None
+        self._gen_count = 0
+        self._models_cache: Optional[Tuple[float, List[Dict[str, Any]]]] = None
+        self._known_models: Set[str] = set()
+        self._known_models_at = 0.0  # monotonic time _known_models was last confirmed
+        self._mem_cache: Optional[Tuple[float, Dict[str, float]]] = None
         self.model_name = settings.LLM_MODEL
         self.ollama_host = settings.OLLAMA_HOST
-        self.client = ollama.Client(host=self.ollama_host)
+        # ollama.Client keeps one httpx connection pool for its lifetime; size it
+        # so concurrent chats reuse warm keep-alive connections
+        self.client = ollama.Client(
+            host=self.ollama_host,
+            timeout=httpx.Timeout(None, connect=5.0),
+            limits=httpx.Limits(max_connections=16, max_keepalive_connections=8)
+        )
         self._initialize()
     
     def _initialize(self):
@@ -58,20 +87,30 @@ class OptimizedLLMManager:
             raise ConnectionError(f"Cannot connect to Ollama at {self.ollama_host}. Ensure Ollama is running.")
     
     def check_memory(self) -> Dict[str, float]:
-        """Check available system memory"""
+        """Check available system memory (cached for MEMORY_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        if self._mem_cache and now - self._mem_cache[0] < self.MEMORY_CACHE_TTL:
+            return self._mem_cache[1]
+        
         mem = psutil.virtual_memory()
-        return {
+        memory = {
             "total_gb": mem.total / (1024**3),
             "available_gb": mem.available / (1024**3),
             "used_gb": mem.used / (1024**3),
             "percent": mem.percent
         }
+        self._mem_cache = (now, memory)
+        return memory
     
     def list_available_models(self) -> List[Dict[str, Any]]:
-        """List models available in Ollama"""
+        """List models available in Ollama (cached for MODELS_CACHE_TTL seconds)"""
+        now = time.monotonic()
+        if self._models_cache and now - self._models_cache[0] < self.MODELS_CACHE_TTL:
+            return self._models_cache[1]
+        
         try:
             models = self.client.list()
-            return [
+            available = [
                 {
                     "name": model.get("name"),
                     "size": model.get("size", 0) / (1024**3),  # Convert to GB
@@ -82,11 +121,26 @@ class OptimizedLLMManager:
         except Exception as e:
             logger.error(f"Failed to list models: {e}")
             return []
+        
+        self._models_cache = (now, available)
+        self._known_models = {m["name"] for m in available}
+        self._known_models_at = now
+        return available
+    
+    def _invalidate_models_cache(self):
+        """Forget the cached model list so the next lookup asks Ollama"""
+        self._models_cache = None
+        self._known_models = set()
     
     def ensure_model(self, model_name: Optional[str] = None) -> bool:
         """Ensure model is available, pull if needed"""
         model = model_name or self.model_name
         
+        # Fast path: model seen in Ollama within MODELS_CACHE_TTL
+        if model in self._known_models and time.monotonic() - self._known_models_at < self.MODELS_CACHE_TTL:
+            self.current_model = model
+            return True
+        
         try:
             # Check if model exists
             models = self.list_available_models()
@@ -108,6 +162,9 @@ class OptimizedLLMManager:
             # Pull the model
             logger.info(f"Pulling model {model}...")
             self.client.pull(model)
+            self._invalidate_models_cache()
+            self._known_models.add(model)
+            self._known_models_at = time.monotonic()
             self.current_model = model
             logger.info(f"Model {model} ready")
             return True
@@ -116,6 +173,12 @@ class OptimizedLLMManager:
             logger.error(f"Failed to ensure model {model}: {e}")
             return False
     
+    def _maybe_collect(self):
+        """Periodically collect young-generation garbage between generations"""
+        self._gen_count += 1
+        if self._gen_count % self.GC_INTERVAL == 0:
+            gc.collect(1)
+    
     def generate(
         self,
         prompt: str,
@@ -123,17 +186,20 @@ class OptimizedLLMManager:
         max_tokens: Optional[int] = None,
         temperature: float = 0.7,
         stream: bool = False,
-        context: Optional[List[int]] = None
+        context: Optional[List[int]] = None,
+        stats: Optional[Dict[str, int]] = None
     ) -> Dict[str, Any]:
-        """Generate response with memory management"""
+        """Generate response with memory management
+        
+        When streaming, a given stats dict receives the final prompt/response token counts.
+        """
         
         # Ensure model is loaded
         model_to_use = model or self.current_model or self.model_name
         if not self.ensure_model(model_to_use):
             raise RuntimeError(f"Model {model_to_use} not available")
         
-        # Force garbage collection before generation
-        gc.collect()
+        self._maybe_collect()
         
         # Prepare generation parameters
         options = {
@@ -150,7 +216,7 @@ class OptimizedLLMManager:
             start_time = time.time()
             
             if stream:
-                return self._generate_stream(model_to_use, prompt, options, context)
+                return self._generate_stream(model_to_use, prompt, options, context, stats)
             
             # Non-streaming generation
             response = self.client.generate(
@@ -178,16 +244,66 @@ class OptimizedLLMManager:
         except Exception as e:
             logger.error(f"Generation failed: {e}")
             raise
+    
+    async def agenerate(self, *args, **kwargs) -> Dict[str, Any]:
+        """Run generate() in a worker thread so the event loop stays responsive"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(self.generate, *args, **kwargs))
+    
+    async def astream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+        context: Optional[List[int]] = None,
+        stats: Optional[Dict[str, int]] = None
+    ) -> AsyncGenerator[str, None]:
+        """Stream generation from a worker thread, yielding chunks on the event loop"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+        
+        def produce():
+            try:
+                for chunk in self.generate(
+                    prompt,
+                    model=model,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                    context=context,
+                    stats=stats
+                ):
+                    if stop.is_set():
+                        break
+                    loop.call_soon_threadsafe(queue.put_nowait, chunk)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
         finally:
-            # Clean up after generation
-            gc.collect()
+            # Let the worker exit early if the consumer went away
+            stop.set()
     
     def _generate_stream(
         self,
         model: str,
         prompt: str,
         options: Dict,
-        context: Optional[List[int]]
+        context: Optional[List[int]],
+        stats: Optional[Dict[str, int]] = None
     ) -> Generator[str, None, None]:
         """Stream generation with memory management"""
         try:
@@ -202,12 +318,14 @@ class OptimizedLLMManager:
             for chunk in stream:
                 if "response" in chunk:
                     yield chunk["response"]
+                # Token counts only arrive on the final chunk
+                if stats is not None and chunk.get("done"):
+                    stats["prompt"] = chunk.get("prompt_eval_count", 0)
+                    stats["response"] = chunk.get("eval_count", 0)
                     
         except Exception as e:
             logger.error(f"Stream generation failed: {e}")
             raise
-        finally:
-            gc.collect()
     
     def format_prompt(
         self,
@@ -217,29 +335,16 @@ class OptimizedLLMManager:
     ) -> str:
         """Format prompt with context and MCP resources"""
         
-        prompt_parts = []
-        
-        # System instruction
-        prompt_parts.append(
-            "You are OAPilot, an AI assistant with access to organizational tools through MCP servers. "
-            "Provide helpful, accurate, and concise responses."
-        )
-        
-        # Add MCP context if available
+        resources_block = ""
         if mcp_resources:
-            prompt_parts.append("\nAvailable MCP Resources:")
-            for resource in mcp_resources:
-                prompt_parts.append(f"- {resource.get('name', 'Unknown')}: {resource.get('description', '')}")
-        
-        # Add additional context
-        if context:
-            prompt_parts.append(f"\nContext:\n{context}")
+            resources_block = "\n\nAvailable MCP Resources:\n" + "\n".join(
+                f"- {resource.get('name', 'Unknown')}: {resource.get('description', '')}"
+                for resource in mcp_resources
+            )
         
-        # Add user query
-        prompt_parts.append(f"\nUser Query: {user_query}")
-        prompt_parts.append("\nResponse:")
+        context_block = f"\n\nContext:\n{context}" if context else ""
         
-        return "\n".join(prompt_parts)
+        return f"{self.SYSTEM_PROMPT}{resources_block}{context_block}\n\nUser Query: {user_query}\n\nResponse:"
     
     def unload_model(self):
         """Unload model to free memory"""
@@ -279,11 +384,14 @@ class OptimizedLLMManager:
 
 # Global instance
 llm_manager = None
+_llm_lock = threading.Lock()
 
 
 def get_llm_manager() -> OptimizedLLMManager:
     """Get or create LLM manager instance"""
     global llm_manager
     if llm_manager is None:
-        llm_manager = OptimizedLLMManager()
+        with _llm_lock:
+            if llm_manager is None:
+                llm_manager = OptimizedLLMManager()
     return llm_manager
\ No newline at end of file
@@ -2,36 +2,123 @@
 
 import asyncio
 import aiohttp
-import json
+import httpx
+import orjson
 import logging
-from typing import Dict, List, Any, Optional
+import time
+from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 import docker
 from docker.errors import DockerException
 
 from app.core.config import settings
+from app.models.schemas import MCPServerInfo
 
 logger = logging.getLogger(__name__)
 
 
+# JSON-RPC over keep-alive HTTP/1.1 connections
+REQUEST_HEADERS = {"Content-Type": "application/json", "Connection": "keep-alive"}
+
+# Pre-encoded body for parameterless requests (method names are plain ASCII)
+_REQUEST_TEMPLATE = b'{"jsonrpc":"2.0","id":%d,"method":"%s"}'
+_MAX_REQUEST_ID = 2**31 - 1
+
+
+def _json_dumps(obj: Any) -> str:
+    """orjson-backed serializer for aiohttp's json_serialize hook (expects str)"""
+    return orjson.dumps(obj).decode()
+
+
+def create_mcp_session(limit: int = 0, limit_per_host: int = 32) -> aiohttp.ClientSession:
+    """Create a keep-alive aiohttp session for MCP JSON-RPC traffic"""
+    timeout = aiohttp.ClientTimeout(total=settings.MCP_TIMEOUT_SECONDS)
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=75,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(
+        timeout=timeout,
+        connector=connector,
+        json_serialize=_json_dumps,
+        headers=REQUEST_HEADERS
+    )
+
+
+def create_http2_client() -> Optional[httpx.AsyncClient]:
+    """Create an HTTP/2 client for https MCP endpoints, or None if h2 is unavailable"""
+    try:
+        return httpx.AsyncClient(
+            http2=True,
+            timeout=settings.MCP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=128),
+            headers={"Content-Type": "application/json"}
+        )
+    except ImportError:
+        logger.warning("HTTP/2 requested for MCP but the h2 package is not installed")
+        return None
+
+
 class MCPClient:
     """Client for communicating with MCP servers via JSON-RPC"""
     
-    def __init__(self, server_id: str, endpoint: str, name: str = ""):
+    # List endpoints whose results can be cached when the server advertises listChanged
+    LIST_KINDS = ("tools", "resources", "prompts")
+    # The HTTP transport never delivers list_changed notifications, so cached
+    # lists are re-fetched after this many seconds (conditionally, via ETag)
+    LIST_CACHE_TTL = 30
+    
+    # Longest wait (seconds) between reconnect attempts to a failing server
+    BREAKER_MAX_BACKOFF = 60
+    
+    # Concurrent requests are coalesced into one JSON-RPC batch per round trip
+    BATCH_MAX_SIZE = 16
+    BATCH_MAX_WAIT = 0.005  # seconds
+    
+    def __init__(self, server_id: str, endpoint: str, name: str = "",
+                 session: Optional[aiohttp.ClientSession] = None):
         self.server_id = server_id
         self.endpoint = endpoint
         self.name = name or server_id
-        self.session = None
+        # A shared session is owned by MCPManager; otherwise the client makes its own
+        self.session = session
+        self._owns_session = session is None
         self.capabilities = {}
         self.is_connected = False
         self._request_id = 0
+        self._breaker_failures = 0
+        self._breaker_open_until = 0.0  # monotonic time before which connect() fails fast
+        self._list_cache: Dict[str, Tuple[float, List[Dict]]] = {}  # kind -> (expires at, items)
+        self._cacheable_lists: Dict[str, bool] = {}
+        self._pending: List[Tuple[Dict, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._batching = True  # switched off if the server rejects array batches
+        self._http2: Optional[httpx.AsyncClient] = None  # set for https endpoints when MCP_HTTP2
+        # method -> (ETag, Last-Modified, last full response) for list requests
+        self._validators: Dict[str, Tuple[Optional[str], Optional[str], Dict]] = {}
     
     async def connect(self) -> bool:
         """Establish connection to MCP server"""
+        # Circuit breaker: fail fast while a recently failing server backs off
+        now = time.monotonic()
+        if now < self._breaker_open_until:
+            logger.debug(f"MCP server {self.name} circuit open, skipping connect")
+            return False
+        
+        # Lists may have changed while we were disconnected
+        self._list_cache.clear()
+        
         try:
             if not self.session:
-                timeout = aiohttp.ClientTimeout(total=settings.MCP_TIMEOUT_SECONDS)
-                self.session = aiohttp.ClientSession(timeout=timeout)
+                self.session = create_mcp_session()
+                self._owns_session = True
+            
+            # Multiplex requests over one HTTP/2 connection where TLS allows ALPN
+            if settings.MCP_HTTP2 and self._http2 is None and self.endpoint.startswith("https://"):
+                self._http2 = create_http2_client()
             
             # Initialize connection with MCP server
             response = await self._send_request("initialize", {
@@ -43,69 +130,249 @@ class MCPClient:
             
             if response and "result" in response:
                 self.capabilities = response["result"].get("capabilities", {})
+                # Only servers that announce list changes let us safely cache lists
+                self._cacheable_lists = {
+                    kind: bool((self.capabilities.get(kind) or {}).get("listChanged"))
+                    for kind in self.LIST_KINDS
+                }
                 self.is_connected = True
+                self._breaker_failures = 0
+                self._breaker_open_until = 0.0
                 logger.info(f"Connected to MCP server {self.name} at {self.endpoint}")
                 return True
                 
         except Exception as e:
             logger.error(f"Failed to connect to MCP server {self.name}: {e}")
             self.is_connected = False
-            
+        
+        # Back off exponentially (capped) before the next attempt
+        self._breaker_failures += 1
+        backoff = min(self.BREAKER_MAX_BACKOFF, 2 ** self._breaker_failures)
+        self._breaker_open_until = time.monotonic() + backoff
+        logger.warning(f"MCP server {self.name} unavailable, retrying in {backoff}s")
         return False
     
+    async def ensure_connected(self) -> bool:
+        """Connect if needed; False when the server is down or backing off"""
+        if self.is_connected:
+            return True
+        return await self.connect()
+    
     async def disconnect(self):
         """Disconnect from MCP server"""
         try:
-            if self.session:
+            # Fail anything still waiting for a batch flush
+            if self._flush_handle is not None:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            for _, future in self._pending:
+                if not future.done():
+                    future.set_result(None)
+            self._pending = []
+            
+            if self.session and self._owns_session:
                 await self.session.close()
                 self.session = None
+            if self._http2 is not None:
+                await self._http2.aclose()
+                self._http2 = None
             self.is_connected = False
+            self._list_cache.clear()
             logger.info(f"Disconnected from MCP server {self.name}")
         except Exception as e:
             logger.error(f"Error disconnecting from MCP server {self.name}: {e}")
     
+    def _next_request_id(self) -> int:
+        """Next JSON-RPC id, wrapping to stay within a signed 32-bit range"""
+        self._request_id = self._request_id % _MAX_REQUEST_ID + 1
+        return self._request_id
+    
     async def _send_request(self, method: str, params: Dict = None) -> Optional[Dict]:
-        """Send JSON-RPC request to MCP server"""
-        self._request_id += 1
+        """Send JSON-RPC request to MCP server
         
+        Requests issued within BATCH_MAX_WAIT of each other are sent together
+        as a single JSON-RPC batch.
+        """
         request = {
             "jsonrpc": "2.0",
-            "id": self._request_id,
+            "id": self._next_request_id(),
             "method": method
         }
         
         if params:
             request["params"] = params
         
+        if not self._batching:
+            return await self._post(request)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((request, future))
+        
+        if len(self._pending) >= self.BATCH_MAX_SIZE:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.BATCH_MAX_WAIT, self._flush_pending)
+        
+        return await future
+    
+    def _flush_pending(self):
+        """Hand the queued requests to a background task as one batch"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._send_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _send_batch(self, batch: List[Tuple[Dict, asyncio.Future]]):
+        """Send queued requests and resolve their futures with the matching responses"""
         try:
-            async with self.session.post(self.endpoint, json=request) as response:
-                if response.status == 200:
-                    return await response.json()
-                else:
-                    logger.error(f"MCP server {self.name} returned status {response.status}")
-                    return None
-                    
-        except asyncio.TimeoutError:
+            if len(batch) == 1:
+                request, future = batch[0]
+                results = [await self._post(request)]
+            else:
+                results = await self._post_batch([request for request, _ in batch])
+            
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            for _, future in batch:
+                if not future.done():
+                    future.set_result(None)
+    
+    async def _post_batch(self, requests: List[Dict]) -> List[Optional[Dict]]:
+        """POST requests as one array batch; responses are returned in request order
+        
+        Requests are re-sent individually only when the server explicitly rejects
+        the batch (4xx, or a non-array reply). After a timeout or transport error
+        the server may already have run them, so they are never sent again.
+        """
+        try:
+            status, _, responses = await self._http_post(requests)
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            logger.error(f"Batch request to MCP server {self.name} timed out")
+            return [None] * len(requests)
+        except Exception as e:
+            logger.error(f"Error sending batch request to MCP server {self.name}: {e}")
+            return [None] * len(requests)
+        
+        if status == 200 and isinstance(responses, list):
+            by_id = {r.get("id"): r for r in responses if isinstance(r, dict)}
+            return [by_id.get(request["id"]) for request in requests]
+        
+        if status == 200 or 400 <= status < 500:
+            # Server does not understand array batches; stop batching for it
+            logger.info(f"MCP server {self.name} does not support batching (status {status}), "
+                        f"sending requests individually")
+            self._batching = False
+            return await asyncio.gather(*(self._post(request) for request in requests))
+        
+        logger.error(f"MCP server {self.name} returned status {status}")
+        return [None] * len(requests)
+    
+    async def _http_post(self, payload: Any, headers: Optional[Dict[str, str]] = None):
+        """POST JSON and return (status, response headers, decoded body or None)"""
+        body = payload if isinstance(payload, bytes) else orjson.dumps(payload)
+        
+        if self._http2 is not None:
+            response = await self._http2.post(self.endpoint, content=body, headers=headers)
+            data = orjson.loads(response.content) if response.status_code == 200 else None
+            return response.status_code, response.headers, data
+        
+        # Encode straight to bytes; the session already sends the JSON content type
+        async with self.session.post(self.endpoint, data=body, headers=headers) as response:
+            # Parse the raw bytes; skips aiohttp's str decode and content-type check
+            data = orjson.loads(await response.read()) if response.status == 200 else None
+            return response.status, response.headers, data
+    
+    async def _post(self, payload: Any) -> Any:
+        """POST a JSON-RPC request (or batch) and return the decoded response"""
+        try:
+            status, _, data = await self._http_post(payload)
+            if status == 200:
+                return data
+            logger.error(f"MCP server {self.name} returned status {status}")
+            
+        except (asyncio.TimeoutError, httpx.TimeoutException):
             logger.error(f"Request to MCP server {self.name} timed out")
         except Exception as e:
             logger.error(f"Error sending request to MCP server {self.name}: {e}")
         
         return None
     
-    async def list_resources(self) -> List[Dict]:
-        """List available resources from MCP server"""
-        if not self.is_connected:
-            await self.connect()
+    async def _send_conditional(self, method: str) -> Optional[Dict]:
+        """Send a parameterless request with HTTP cache validators
+        
+        If the server previously returned an ETag or Last-Modified for this
+        method, a 304 reply reuses the stored response without a body.
+        """
+        # Parameterless request encoded straight from the bytes template
+        request = _REQUEST_TEMPLATE % (self._next_request_id(), method.encode())
+        
+        headers = {}
+        validators = self._validators.get(method)
+        if validators:
+            etag, last_modified, _ = validators
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        
+        try:
+            status, response_headers, result = await self._http_post(request, headers)
+            if status == 304 and validators:
+                return validators[2]
+            if status != 200:
+                logger.error(f"MCP server {self.name} returned status {status}")
+                return None
+            
+            etag = response_headers.get("ETag")
+            last_modified = response_headers.get("Last-Modified")
+            if (etag or last_modified) and isinstance(result, dict) and "result" in result:
+                self._validators[method] = (etag, last_modified, result)
+            else:
+                self._validators.pop(method, None)
+            return result
+            
+        except (asyncio.TimeoutError, httpx.TimeoutException):
+            logger.error(f"Request to MCP server {self.name} timed out")
+        except Exception as e:
+            logger.error(f"Error sending request to MCP server {self.name}: {e}")
         
-        response = await self._send_request("resources/list")
+        return None
+    
+    async def _list(self, kind: str) -> List[Dict]:
+        """Fetch a tools/resources/prompts list, served from cache when allowed"""
+        if not await self.ensure_connected():
+            return []
+        
+        cached = self._list_cache.get(kind)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        # Sent on its own (not batched) so the server's ETag/Last-Modified
+        # applies to this list alone
+        response = await self._send_conditional(f"{kind}/list")
         if response and "result" in response:
-            return response["result"].get("resources", [])
+            items = response["result"].get(kind, [])
+            if self._cacheable_lists.get(kind):
+                self._list_cache[kind] = (time.monotonic() + self.LIST_CACHE_TTL, items)
+            return items
         return []
     
+    async def list_resources(self) -> List[Dict]:
+        """List available resources from MCP server"""
+        return await self._list("resources")
+    
     async def read_resource(self, resource_uri: str) -> Optional[Dict]:
         """Read a specific resource"""
-        if not self.is_connected:
-            await self.connect()
+        if not await self.ensure_connected():
+            return None
         
         response = await self._send_request("resources/read", {
             "uri": resource_uri
@@ -117,18 +384,12 @@ class MCPClient:
     
     async def list_tools(self) -> List[Dict]:
         """List available tools from MCP server"""
-        if not self.is_connected:
-            await self.connect()
-        
-        response = await self._send_request("tools/list")
-        if response and "result" in response:
-            return response["result"].get("tools", [])
-        return []
+        return await self._list("tools")
     
     async def call_tool(self, tool_name: str, arguments: Dict = None) -> Optional[Dict]:
         """Call a tool on the MCP server"""
-        if not self.is_connected:
-            await self.connect()
+        if not await self.ensure_connected():
+            return None
         
         response = await self._send_request("tools/call", {
             "name": tool_name,
@@ -141,18 +402,12 @@ class MCPClient:
     
     async def list_prompts(self) -> List[Dict]:
         """List available prompts from MCP server"""
-        if not self.is_connected:
-            await self.connect()
-        
-        response = await self._send_request("prompts/list")
-        if response and "result" in response:
-            return response["result"].get("prompts", [])
-        return []
+        return await self._list("prompts")
     
     async def get_prompt(self, prompt_name: str, arguments: Dict = None) -> Optional[str]:
         """Get a prompt template from the MCP server"""
-        if not self.is_connected:
-            await self.connect()
+        if not await self.ensure_connected():
+            return None
         
         response = await self._send_request("prompts/get", {
             "name": prompt_name,
@@ -180,6 +435,7 @@ class MCPDiscovery:
     def __init__(self):
         self.docker_client = None
         self.mcp_servers = {}
+        self._discovered: Optional[Tuple[float, List[Dict]]] = None  # (monotonic time, servers)
     
     def _init_docker(self):
         """Initialize Docker client"""
@@ -195,63 +451,82 @@ class MCPDiscovery:
         if not settings.MCP_AUTO_DISCOVER:
             return []
         
-        self._init_docker()
-        servers = []
+        # Reuse recent results instead of querying the Docker Engine again
+        if self._discovered is not None:
+            discovered_at, servers = self._discovered
+            if time.monotonic() - discovered_at < settings.MCP_DISCOVERY_TTL:
+                return list(servers)
+        
+        # Creating the client reads Docker config and may touch the socket
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._init_docker)
         
         try:
-            # Look for containers with MCP label or specific naming pattern
-            containers = self.docker_client.containers.list(
-                filters={"status": "running"}
+            servers = await loop.run_in_executor(None, self._discover_servers_sync)
+        except Exception as e:
+            logger.error(f"Error discovering MCP servers: {e}")
+            return []
+        
+        self._discovered = (time.monotonic(), servers)
+        return list(servers)
+    
+    def _discover_servers_sync(self) -> List[Dict]:
+        """Query Docker for MCP containers (blocking)"""
+        api = self.docker_client.api
+        servers = []
+        
+        # The low-level listing returns light summaries without inspecting each container
+        containers = api.containers(filters={"status": "running"})
+        
+        for summary in containers:
+            # Check for MCP label or name pattern
+            labels = summary.get("Labels") or {}
+            names = summary.get("Names") or []
+            name = names[0].lstrip("/") if names else summary["Id"][:12]
+            
+            is_mcp = (
+                labels.get("mcp-server") == "true" or
+                "mcp" in name.lower() or
+                labels.get("com.modelcontextprotocol.server") == "true"
             )
             
-            for container in containers:
-                # Check for MCP label or name pattern
-                labels = container.labels
-                name = container.name
-                
-                is_mcp = (
-                    labels.get("mcp-server") == "true" or
-                    "mcp" in name.lower() or
-                    labels.get("com.modelcontextprotocol.server") == "true"
-                )
-                
-                if is_mcp:
-                    # Get container network info
-                    networks = container.attrs["NetworkSettings"]["Networks"]
-                    ports = container.attrs["NetworkSettings"]["Ports"]
-                    
-                    # Find the endpoint
-                    endpoint = None
-                    port = labels.get("mcp-port", "8000")
-                    
-                    # Try to get host port mapping
-                    if ports:
-                        for container_port, host_ports in ports.items():
-                            if host_ports and container_port.startswith(str(port)):
-                                endpoint = f"http://localhost:{host_ports[0]['HostPort']}"
-                                break
-                    
-                    # Fallback to container IP
-                    if not endpoint:
-                        for network_info in networks.values():
-                            if network_info.get("IPAddress"):
-                                endpoint = f"http://{network_info['IPAddress']}:{port}"
-                                break
-                    
-                    if endpoint:
-                        server_info = {
-                            "server_id": container.short_id,
-                            "name": name,
-                            "container_id": container.id,
-                            "endpoint": endpoint,
-                            "labels": labels,
-                            "status": "discovered"
-                        }
-                        servers.append(server_info)
-                        logger.info(f"Discovered MCP server: {name} at {endpoint}")
+            if not is_mcp:
+                continue
             
-        except Exception as e:
-            logger.error(f"Error discovering MCP servers: {e}")
+            # Inspect only matching containers for network info
+            attrs = api.inspect_container(summary["Id"])
+            networks = attrs["NetworkSettings"]["Networks"]
+            ports = attrs["NetworkSettings"]["Ports"]
+            
+            # Find the endpoint
+            endpoint = None
+            port = labels.get("mcp-port", "8000")
+            
+            # Try to get host port mapping
+            if ports:
+                for container_port, host_ports in ports.items():
+                    if host_ports and container_port.startswith(str(port)):
+                        endpoint = f"http://localhost:{host_ports[0]['HostPort']}"
+                        break
+            
+            # Fallback to container IP
+            if not endpoint:
+                for network_info in networks.values():
+                    if network_info.get("IPAddress"):
+                        endpoint = f"http://{network_info['IPAddress']}:{port}"
+                        break
+            
+            if endpoint:
+                server_info = {
+                    "server_id": summary["Id"][:12],
+                    "name": name,
+                    "container_id": summary["Id"],
+                    "endpoint": endpoint,
+                    "labels": labels,
+                    "status": "discovered"
+                }
+                servers.append(server_info)
+                logger.info(f"Discovered MCP server: {name} at {endpoint}")
         
         return servers
     
@@ -270,13 +545,63 @@ class MCPDiscovery:
 class MCPManager:
     """Manage multiple MCP client connections"""
     
+    # Maximum number of health probes in flight at once
+    HEALTH_CHECK_CONCURRENCY = 16
+    # Seconds before an unresponsive server is reported unhealthy
+    HEALTH_CHECK_TIMEOUT = 2.0
+    
     def __init__(self):
         self.clients: Dict[str, MCPClient] = {}
         self.discovery = MCPDiscovery()
         self._lock = asyncio.Lock()
+        self._connecting: Set[str] = set()  # servers reserved while their handshake runs
+        self._healthy_since: Dict[str, float] = {}  # server_id -> last healthy probe time
+        self._session: Optional[aiohttp.ClientSession] = None  # shared by all clients
+        self._last_health_check: Dict[str, datetime] = {}
+        self._server_info_cache: Optional[List[MCPServerInfo]] = None
+        self._server_info_state: Tuple = ()  # connection flags the cache was built from
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create the connection pool shared by all MCP clients"""
+        if self._session is None or self._session.closed:
+            self._session = create_mcp_session(
+                limit=settings.MAX_MCP_CONNECTIONS * 4,
+                limit_per_host=16
+            )
+        return self._session
+    
+    def invalidate_server_info(self):
+        """Drop the server info snapshot (after add/remove/health changes)"""
+        self._server_info_cache = None
+    
+    def get_server_info(self) -> List[MCPServerInfo]:
+        """Snapshot of all registered servers, rebuilt only when something changed
+        
+        Connection state can also flip on reconnects outside add/remove/health
+        checks, so the snapshot is keyed on each client's is_connected flag.
+        """
+        state = tuple((sid, c.is_connected) for sid, c in self.clients.items())
+        if self._server_info_cache is None or state != self._server_info_state:
+            self._server_info_cache = [
+                MCPServerInfo.model_construct(
+                    server_id=server_id,
+                    name=client.name,
+                    container_id=getattr(client, 'container_id', None),
+                    endpoint=client.endpoint,
+                    status="connected" if is_connected else "disconnected",
+                    is_active=is_connected,
+                    capabilities=client.capabilities,
+                    last_health_check=self._last_health_check.get(server_id),
+                    error_message=None
+                )
+                for (server_id, is_connected), client in zip(state, self.clients.values())
+            ]
+            self._server_info_state = state
+        return self._server_info_cache
     
     async def initialize(self):
         """Initialize MCP manager and discover servers"""
+        self._get_session()
         if settings.MCP_AUTO_DISCOVER:
             await self.auto_discover()
     
@@ -295,37 +620,64 @@ class MCPManager:
     
     async def add_server(self, server_id: str, endpoint: str, name: str = "") -> bool:
         """Add and connect to an MCP server"""
+        # The lock only guards bookkeeping; the handshake runs outside it so
+        # one slow server does not hold up changes to the others
         async with self._lock:
-            if server_id in self.clients:
+            if server_id in self.clients or server_id in self._connecting:
                 logger.warning(f"MCP server {server_id} already exists")
                 return False
             
-            # Check connection limit
-            if len(self.clients) >= settings.MAX_MCP_CONNECTIONS:
+            # Check connection limit (servers mid-handshake hold a slot)
+            if len(self.clients) + len(self._connecting) >= settings.MAX_MCP_CONNECTIONS:
                 logger.warning(f"Maximum MCP connections ({settings.MAX_MCP_CONNECTIONS}) reached")
                 return False
             
-            client = MCPClient(server_id, endpoint, name)
-            if await client.connect():
-                self.clients[server_id] = client
-                return True
-            
-            return False
+            self._connecting.add(server_id)
+        
+        connected = False
+        try:
+            client = MCPClient(server_id, endpoint, name, session=self._get_session())
+            connected = await client.connect()
+        finally:
+            async with self._lock:
+                self._connecting.discard(server_id)
+                if connected:
+                    self.clients[server_id] = client
+                    self.invalidate_server_info()
+        
+        return connected
     
     async def remove_server(self, server_id: str):
         """Remove and disconnect from an MCP server"""
         async with self._lock:
-            if server_id in self.clients:
-                await self.clients[server_id].disconnect()
-                del self.clients[server_id]
+            client = self.clients.pop(server_id, None)
+            self._healthy_since.pop(server_id, None)
+            self._last_health_check.pop(server_id, None)
+            self.invalidate_server_info()
+        
+        if client:
+            await client.disconnect()
     
-    async def get_all_resources(self) -> Dict[str, List[Dict]]:
-        """Get resources from all connected MCP servers"""
-        resources = {}
+    async def get_all_resources(self, server_ids: Optional[List[str]] = None) -> Dict[str, List[Dict]]:
+        """Get resources from all connected MCP servers, or only those in server_ids"""
+        if server_ids is None:
+            candidates = self.clients.items()
+        else:
+            candidates = [(server_id, self.clients[server_id]) for server_id in server_ids
+                          if server_id in self.clients]
+        connected = [(server_id, client) for server_id, client in candidates
+                     if client.is_connected]
+        results = await asyncio.gather(
+            *(client.list_resources() for _, client in connected),
+            return_exceptions=True
+        )
         
-        for server_id, client in self.clients.items():
-            if client.is_connected:
-                resources[server_id] = await client.list_resources()
+        resources = {}
+        for (server_id, _), result in zip(connected, results):
+            if isinstance(result, Exception):
+                logger.error(f"Failed to list resources from MCP server {server_id}: {result}")
+                continue
+            resources[server_id] = result
         
         return resources
     
@@ -335,8 +687,8 @@ class MCPManager:
             return {"success": False, "error": "Server not found"}
         
         client = self.clients[server_id]
-        if not client.is_connected:
-            await client.connect()
+        if not await client.ensure_connected():
+            return {"success": False, "error": "Server unavailable"}
         
         try:
             result = await client.call_tool(tool_name, arguments)
@@ -345,19 +697,61 @@ class MCPManager:
             return {"success": False, "error": str(e)}
     
     async def health_check_all(self) -> Dict[str, bool]:
-        """Health check all MCP servers"""
-        results = {}
+        """Health check all MCP servers concurrently
+        
+        Servers that answered healthy within the last MCP_TIMEOUT_SECONDS / 4
+        seconds are not probed again, which absorbs dashboard polling. A probe
+        that takes longer than HEALTH_CHECK_TIMEOUT counts as unhealthy.
+        """
+        clients = list(self.clients.items())
+        if not clients:
+            return {}
         
-        for server_id, client in self.clients.items():
-            results[server_id] = await client.health_check()
+        ttl = settings.MCP_TIMEOUT_SECONDS / 4
+        now = time.monotonic()
+        semaphore = asyncio.Semaphore(min(self.HEALTH_CHECK_CONCURRENCY, len(clients)))
         
-        return results
+        async def probe(server_id: str, client: MCPClient):
+            last_healthy = self._healthy_since.get(server_id)
+            if last_healthy is not None and now - last_healthy < ttl:
+                return server_id, True
+            
+            async with semaphore:
+                try:
+                    healthy = await asyncio.wait_for(client.health_check(), self.HEALTH_CHECK_TIMEOUT)
+                except asyncio.TimeoutError:
+                    healthy = False
+            
+            self._last_health_check[server_id] = datetime.utcnow()
+            if healthy:
+                self._healthy_since[server_id] = time.monotonic()
+            else:
+                self._healthy_since.pop(server_id, None)
+            return server_id, healthy
+        
+        results = await asyncio.gather(
+            *(probe(sid, c) for sid, c in clients),
+            return_exceptions=True
+        )
+        self.invalidate_server_info()
+        # A probe that raised counts as unhealthy
+        return {
+            sid: (not isinstance(result, BaseException) and result[1])
+            for (sid, _), result in zip(clients, results)
+        }
     
     async def shutdown(self):
         """Shutdown all MCP connections"""
         for client in self.clients.values():
             await client.disconnect()
         self.clients.clear()
+        self._healthy_since.clear()
+        self._last_health_check.clear()
+        self.invalidate_server_info()
+        
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
 
 
 # Global instance
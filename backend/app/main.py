@@ -4,19 +4,26 @@ import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 import sys
+import threading
+import time
 from pathlib import Path
+from typing import Dict, Tuple
 
 # Add parent directory to Python path for module imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.core.config import settings
-from app.core.database import init_db, engine
+from app.core.database import init_db, engine, SessionLocal
 from app.core.llm_manager import get_llm_manager
 from app.core.mcp_client import get_mcp_manager
+from app.core.executors import shutdown_executors
+from app.core.compression import SelectiveGZipMiddleware
+from app.services.artifact_buffer import get_artifact_buffer
+from app.services.generation_queue import get_generation_queue
 from app.services.storage_manager import get_storage_manager
 from app.api.v1 import chat, artifacts, mcp, system, awsq_mcp
 
@@ -44,6 +51,14 @@ async def lifespan(app: FastAPI):
     init_db()
     logger.info("Database initialized")
     
+    # Confirm the artifact list queries use their indexes / rowid scan
+    if settings.DEBUG:
+        db = SessionLocal()
+        try:
+            artifacts.log_list_query_plans(db)
+        finally:
+            db.close()
+    
     # Initialize LLM manager (non-blocking)
     try:
         llm_manager = get_llm_manager()
@@ -74,6 +89,17 @@ async def lifespan(app: FastAPI):
     storage_manager = get_storage_manager()
     logger.info("Storage manager initialized")
     
+    # Start batched artifact writer
+    artifact_buffer = get_artifact_buffer()
+    artifact_buffer.start()
+    
+    # Start LLM generation workers
+    generation_queue = get_generation_queue()
+    generation_queue.start()
+    
+    # Sample CPU usage in the background for /resources and /health
+    system.start_cpu_sampler()
+    
     # Check and enforce storage limits on startup
     if settings.AUTO_CLEANUP_ENABLED:
         await storage_manager.enforce_storage_limits()
@@ -87,6 +113,18 @@ async def lifespan(app: FastAPI):
     if mcp_manager:
         await mcp_manager.shutdown()
     
+    # Stop generation workers before the stores they write to
+    await generation_queue.stop()
+    
+    # Write any queued artifact rows
+    await artifact_buffer.stop()
+    
+    # Stop background CPU sampling
+    await system.stop_cpu_sampler()
+    
+    # Stop executor pools
+    shutdown_executors()
+    
     # Close database connections
     engine.dispose()
     
@@ -98,7 +136,8 @@ app = FastAPI(
     title="OAPilot API",
     description="Offline AI Pilot System - Local LLM with MCP Integration",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -110,11 +149,43 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress text responses (artifact content, MCP resource dumps)
+app.add_middleware(
+    SelectiveGZipMiddleware,
+    minimum_size=settings.GZIP_MIN_SIZE,
+    compresslevel=settings.GZIP_LEVEL,
+)
+
+# Tracebacks per exception type: the first few in each window, then one-line summaries
+TRACEBACK_WINDOW_SECONDS = 10.0
+TRACEBACKS_PER_WINDOW = 3
+_traceback_log: Dict[str, Tuple[float, int]] = {}  # type name -> (window start, count)
+_traceback_lock = threading.Lock()
+
+
+def _should_log_traceback(name: str) -> Tuple[bool, int]:
+    """Whether this occurrence gets a full traceback, and its count in the window"""
+    now = time.monotonic()
+    with _traceback_lock:
+        window_start, count = _traceback_log.get(name, (now, 0))
+        if now - window_start >= TRACEBACK_WINDOW_SECONDS:
+            window_start, count = now, 0
+        count += 1
+        _traceback_log[name] = (window_start, count)
+    return count <= TRACEBACKS_PER_WINDOW, count
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    logger.error(f"Global exception: {exc}", exc_info=True)
-    return JSONResponse(
+    name = type(exc).__name__
+    with_traceback, count = _should_log_traceback(name)
+    if with_traceback:
+        logger.error(f"Global exception: {exc}", exc_info=True)
+    else:
+        # Formatting a traceback per error would become its own bottleneck in an error storm
+        logger.error(f"Global exception: {name}: {exc} (traceback suppressed, {count} in window)")
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "An internal error occurred"}
     )
@@ -1,20 +1,25 @@
 """Artifact model for storing generated content"""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
-from app.core.database import Base
+from app.core.database import Base, UUIDBinary
 
 
 class Artifact(Base):
     """Artifact model for storing generated files and content"""
     __tablename__ = "artifacts"
+    __table_args__ = (
+        # Match list_artifacts: filter by session (and type), newest first, no sort step
+        Index("ix_art_session_created", "session_id", "created_at"),
+        Index("ix_art_session_type_created", "session_id", "type", "created_at"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    artifact_id = Column(String(36), unique=True, index=True, nullable=False)
-    session_id = Column(String(36), ForeignKey("chat_sessions.session_id", ondelete="CASCADE"))
-    message_id = Column(String(36), ForeignKey("chat_messages.message_id", ondelete="CASCADE"))
+    id = Column(Integer, primary_key=True)
+    artifact_id = Column(UUIDBinary, unique=True, index=True, nullable=False)
+    session_id = Column(UUIDBinary, ForeignKey("chat_sessions.session_id", ondelete="CASCADE"))
+    message_id = Column(UUIDBinary, ForeignKey("chat_messages.message_id", ondelete="CASCADE"))
     type = Column(String(50), nullable=False)  # "code", "document", "diagram", "data"
     name = Column(String(200), nullable=False)
     description = Column(Text)
@@ -26,6 +31,4 @@ class Artifact(Base):
     
     # Relationships
     session = relationship("ChatSession", back_populates="artifacts")
-    
-    def __repr__(self):
-        return f"<Artifact(artifact_id={self.artifact_id}, type={self.type}, name={self.name})>"
\ No newline at end of file
+    message = relationship("ChatMessage")  # many-to-one; batch with selectinload
\ No newline at end of file
@@ -1,18 +1,18 @@
 """Chat session and message models"""
 
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, JSON, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
-from app.core.database import Base
+from app.core.database import Base, UUIDBinary
 
 
 class ChatSession(Base):
     """Chat session model"""
     __tablename__ = "chat_sessions"
     
-    id = Column(Integer, primary_key=True, index=True)
-    session_id = Column(String(36), unique=True, index=True, nullable=False)
+    id = Column(Integer, primary_key=True)
+    session_id = Column(UUIDBinary, unique=True, index=True, nullable=False)
     title = Column(String(200))
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -23,27 +23,38 @@ class ChatSession(Base):
     # Relationships
     messages = relationship("ChatMessage", back_populates="session", cascade="all, delete-orphan")
     artifacts = relationship("Artifact", back_populates="session", cascade="all, delete-orphan")
-    
-    def __repr__(self):
-        return f"<ChatSession(session_id={self.session_id}, title={self.title})>"
 
 
 class ChatMessage(Base):
     """Chat message model"""
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Match get_session_messages: filter by session, in timestamp order, no sort step
+        Index("ix_chat_message_session_ts", "session_id", "timestamp"),
+    )
     
-    id = Column(Integer, primary_key=True, index=True)
-    message_id = Column(String(36), unique=True, index=True, nullable=False)
-    session_id = Column(String(36), ForeignKey("chat_sessions.session_id", ondelete="CASCADE"))
+    id = Column(Integer, primary_key=True)
+    message_id = Column(UUIDBinary, unique=True, index=True, nullable=False)
+    session_id = Column(UUIDBinary, ForeignKey("chat_sessions.session_id", ondelete="CASCADE"))
     role = Column(String(20), nullable=False)  # "user", "assistant", "system"
     content = Column(Text, nullable=False)
     mcp_resources_used = Column(JSON)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    tokens_used = Column(JSON)
+    prompt_tokens = Column(Integer)
+    response_tokens = Column(Integer)
+    total_tokens = Column(Integer)
     processing_time = Column(Float)
     
     # Relationships
     session = relationship("ChatSession", back_populates="messages")
     
-    def __repr__(self):
-        return f"<ChatMessage(message_id={self.message_id}, role={self.role})>"
\ No newline at end of file
+    @property
+    def tokens_used(self):
+        """Token counts in the API's {"prompt", "response", "total"} shape"""
+        if self.total_tokens is None:
+            return None
+        return {
+            "prompt": self.prompt_tokens or 0,
+            "response": self.response_tokens or 0,
+            "total": self.total_tokens
+        }
\ No newline at end of file
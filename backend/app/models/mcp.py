@@ -10,7 +10,7 @@ class MCPServer(Base):
     """MCP Server configuration and status"""
     __tablename__ = "mcp_servers"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     server_id = Column(String(100), unique=True, index=True, nullable=False)
     name = Column(String(200), nullable=False)
     container_id = Column(String(100))
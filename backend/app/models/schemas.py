@@ -1,7 +1,7 @@
 """Pydantic schemas for API requests and responses"""
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, TypedDict
 from datetime import datetime
 from enum import Enum
 
@@ -58,6 +58,23 @@ class ChatMessageResponse(BaseModel):
         from_attributes = True
 
 
+class ChatMessageDict(TypedDict):
+    """Plain-dict form of ChatMessageResponse for hot list endpoints (no validation pass)"""
+    message_id: str
+    session_id: str
+    role: str
+    content: str
+    mcp_resources_used: Optional[Dict[str, Any]]
+    timestamp: datetime
+    tokens_used: Optional[Dict[str, int]]
+    processing_time: Optional[float]
+
+
+class ChatMessageBatchRequest(BaseModel):
+    session_ids: List[str] = Field(..., min_length=1, max_length=100)
+    limit: int = Field(20, ge=1, le=100, description="Most recent messages per session")
+
+
 class QueryRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=10000)
     session_id: Optional[str] = None
@@ -108,6 +125,10 @@ class ArtifactResponse(BaseModel):
         from_attributes = True
 
 
+class ArtifactWithMessageResponse(ArtifactResponse):
+    message: Optional[ChatMessageResponse] = None
+
+
 # MCP Schemas
 class MCPServerInfo(BaseModel):
     server_id: str
@@ -179,7 +200,7 @@ class MCPResourceResponse(BaseModel):
 class ResourceUsage(BaseModel):
     memory: Dict[str, float]
     disk: Dict[str, float]
-    cpu: Dict[str, float]
+    cpu: Dict[str, Any]  # load_avg is a 3-element list
     database: Dict[str, float]
     artifacts: Dict[str, float]
 
@@ -0,0 +1,107 @@
+"""Buffered artifact inserts, flushed to the database in batches"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.database import SessionLocal
+from app.models.artifact import Artifact
+from app.services.storage_manager import get_storage_manager
+
+logger = logging.getLogger(__name__)
+
+
+class ArtifactWriteBuffer:
+    """Collect artifact rows and insert them in one transaction per flush"""
+    
+    FLUSH_INTERVAL = 0.05  # seconds between flushes
+    MAX_BATCH = 128  # flush early once this many rows are queued
+    
+    def __init__(self):
+        self._pending: List[Dict[str, Any]] = []
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()  # a flush returns only once earlier writes landed
+    
+    def enqueue(self, record: Dict[str, Any]):
+        """Queue an artifact row (column name -> value) for the next flush"""
+        self._pending.append(record)
+        if len(self._pending) >= self.MAX_BATCH:
+            self._wake.set()
+    
+    def start(self):
+        """Start the background flush loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.flush_loop())
+    
+    async def stop(self):
+        """Stop the flush loop and write anything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+    
+    async def flush_loop(self):
+        """Flush every FLUSH_INTERVAL, or sooner when MAX_BATCH rows are queued"""
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+    
+    async def flush(self):
+        """Write all queued rows now"""
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            
+            # Swap before awaiting, so no row is flushed twice
+            batch, self._pending = self._pending, []
+            await run_in_threadpool(self._write, batch)
+    
+    @staticmethod
+    def _write(batch: List[Dict[str, Any]]):
+        """Insert a batch in one transaction, falling back to row by row on error"""
+        db = SessionLocal()
+        try:
+            try:
+                db.bulk_insert_mappings(Artifact, batch)
+                db.commit()
+                return
+            except Exception as e:
+                db.rollback()
+                logger.warning(f"Bulk artifact insert failed, retrying rows individually: {e}")
+            
+            # One bad row (e.g. its session was deleted meanwhile) must not drop the rest
+            for record in batch:
+                try:
+                    db.bulk_insert_mappings(Artifact, [record])
+                    db.commit()
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Failed to store artifact {record.get('artifact_id')}: {e}")
+                    # The row is dropped, so its file would be orphaned
+                    if record.get("file_path"):
+                        get_storage_manager().delete_artifact_file(record["file_path"])
+        finally:
+            db.close()
+
+
+# Global instance
+artifact_buffer = None
+
+
+def get_artifact_buffer() -> ArtifactWriteBuffer:
+    """Get or create artifact write buffer instance"""
+    global artifact_buffer
+    if artifact_buffer is None:
+        artifact_buffer = ArtifactWriteBuffer()
+    return artifact_buffer
@@ -0,0 +1,71 @@
+"""Bounded queue for LLM generation jobs, run by a fixed set of worker tasks"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class GenerationQueue:
+    """Run chat/query generation outside the request path with bounded concurrency"""
+    
+    def __init__(self, workers: int, maxsize: int):
+        self.workers = workers
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self._tasks: List[asyncio.Task] = []
+    
+    def full(self) -> bool:
+        """Whether a new job would be rejected"""
+        return self._queue.full()
+    
+    def enqueue(self, func: Callable[..., Awaitable[Any]], *args) -> bool:
+        """Queue func(*args); False if the queue is full"""
+        try:
+            self._queue.put_nowait((func, args))
+            return True
+        except asyncio.QueueFull:
+            return False
+    
+    def start(self):
+        """Start the worker tasks"""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+    
+    async def stop(self):
+        """Cancel the workers; jobs still queued are dropped"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        
+        if not self._queue.empty():
+            logger.warning(f"Dropping {self._queue.qsize()} queued generation jobs on shutdown")
+    
+    async def _worker(self):
+        """Run queued jobs one at a time"""
+        while True:
+            func, args = await self._queue.get()
+            try:
+                await func(*args)
+            except Exception as e:
+                logger.error(f"Generation job {func.__name__} failed: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# Global instance
+generation_queue: Optional[GenerationQueue] = None
+
+
+def get_generation_queue() -> GenerationQueue:
+    """Get or create generation queue instance"""
+    global generation_queue
+    if generation_queue is None:
+        generation_queue = GenerationQueue(
+            workers=settings.LLM_WORKERS,
+            maxsize=settings.LLM_QUEUE_SIZE
+        )
+    return generation_queue
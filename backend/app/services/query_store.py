@@ -0,0 +1,139 @@
+"""Expiring store for direct query state (processing requests and results)"""
+
+from collections import OrderedDict
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from app.core.config import settings
+from app.models.schemas import QueryResult
+
+
+class QueryStream:
+    """Response chunks of a processing query, for any number of followers"""
+    
+    def __init__(self):
+        self.chunks: List[str] = []
+        self.done = False
+        self._changed = asyncio.Event()
+    
+    def append(self, chunk: str):
+        """Add a generated chunk and wake followers"""
+        self.chunks.append(chunk)
+        self._notify()
+    
+    def close(self):
+        """Mark generation finished and wake followers"""
+        self.done = True
+        self._notify()
+    
+    def _notify(self):
+        # Followers hold the old event; a fresh one is armed for the next change
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    async def follow(self) -> AsyncGenerator[str, None]:
+        """Yield every chunk from the start, then new ones until closed"""
+        sent = 0
+        while True:
+            changed = self._changed
+            while sent < len(self.chunks):
+                yield self.chunks[sent]
+                sent += 1
+            if self.done:
+                return
+            await changed.wait()
+
+
+class QueryStore:
+    """Query state kept for QUERY_TTL_SECONDS, at most QUERY_CACHE_MAX entries each
+    
+    Both maps are LRU-ordered: reads move an entry to the end, and inserts past
+    maxsize evict from the front. Expired entries are dropped on access or when
+    they reach the front, so memory stays bounded either way.
+    """
+    
+    def __init__(self, ttl: float, maxsize: int):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._processing: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()  # id -> (expires at, query)
+        self._completed: "OrderedDict[str, Tuple[float, QueryResult]]" = OrderedDict()  # id -> (expires at, result)
+        self._streams: Dict[str, QueryStream] = {}  # processing id -> chunks generated so far
+    
+    def start(self, query_id: str, query: dict):
+        """Record a query as processing"""
+        self._put(self._processing, query_id, query)
+        self._streams[query_id] = QueryStream()
+    
+    def complete(self, query_id: str, result: QueryResult):
+        """Move a query from processing to completed"""
+        # Publish the result before dropping the processing entry, so a poll
+        # never sees the query in neither map
+        self._put(self._completed, query_id, result)
+        self._processing.pop(query_id, None)
+        stream = self._streams.pop(query_id, None)
+        if stream is not None:
+            stream.close()
+    
+    def get_stream(self, query_id: str) -> Optional[QueryStream]:
+        """Chunk stream of a processing query, or None"""
+        return self._streams.get(query_id)
+    
+    def get_processing(self, query_id: str) -> Optional[dict]:
+        """Query data for a processing query, or None"""
+        return self._get(self._processing, query_id)
+    
+    def get_result(self, query_id: str) -> Optional[QueryResult]:
+        """Result of a completed query, or None"""
+        return self._get(self._completed, query_id)
+    
+    def status(self, query_id: str) -> Optional[str]:
+        """Query status: completed, processing, or None if unknown/expired"""
+        if self.get_result(query_id) is not None:
+            return "completed"
+        if self.get_processing(query_id) is not None:
+            return "processing"
+        return None
+    
+    def _put(self, entries: "OrderedDict[str, Tuple[float, Any]]", query_id: str, value: Any):
+        """Insert as most recently used, then trim expired and over-limit entries"""
+        now = time.monotonic()
+        entries[query_id] = (now + self.ttl, value)
+        entries.move_to_end(query_id)
+        while entries:
+            expires_at = next(iter(entries.values()))[0]
+            if expires_at > now and len(entries) <= self.maxsize:
+                break
+            evicted_id, _ = entries.popitem(last=False)
+            self._drop_stream(entries, evicted_id)
+    
+    def _get(self, entries: "OrderedDict[str, Tuple[float, Any]]", query_id: str) -> Optional[Any]:
+        """Live value for query_id; an expired entry is dropped on access"""
+        entry = entries.get(query_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del entries[query_id]
+            self._drop_stream(entries, query_id)
+            return None
+        entries.move_to_end(query_id)
+        return entry[1]
+    
+    def _drop_stream(self, entries: "OrderedDict[str, Tuple[float, Any]]", query_id: str):
+        """Free the chunk stream of an evicted processing entry, waking its followers"""
+        if entries is self._processing:
+            stream = self._streams.pop(query_id, None)
+            if stream is not None:
+                stream.close()
+
+
+# Global instance
+query_store = None
+
+
+def get_query_store() -> QueryStore:
+    """Get or create query store instance"""
+    global query_store
+    if query_store is None:
+        query_store = QueryStore(ttl=settings.QUERY_TTL_SECONDS, maxsize=settings.QUERY_CACHE_MAX)
+    return query_store
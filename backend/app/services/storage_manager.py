@@ -1,28 +1,93 @@
 """Storage management service for artifacts and database optimization"""
 
+import asyncio
+import heapq
 import os
 import shutil
 import sqlite3
+import time
+import uuid
+from collections import OrderedDict
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple
 import logging
 
+import aiofiles
+import aiofiles.os
+
 from app.core.config import settings
 from app.core.database import engine, vacuum_database
+from app.core.executors import get_io_pool, get_cpu_pool
 
 logger = logging.getLogger(__name__)
 
+# Constant SQL text so sqlite3's statement cache reuses the prepared statement
+_DELETE_EXPIRED_SESSIONS = """
+    DELETE FROM chat_sessions 
+    WHERE created_at < ?
+    RETURNING session_id
+"""
+
+
+def _walk_files(path) -> Iterator[os.DirEntry]:
+    """Yield a DirEntry for every regular file under path (symlinks not followed)
+    
+    Iterative with an explicit stack, so deep trees neither hit the recursion
+    limit nor pay for a chain of nested generators per yielded file.
+    """
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except (FileNotFoundError, NotADirectoryError, PermissionError):
+            continue
+
+
+def _select_largest_files(root: str, target_size: float) -> Tuple[int, List[Tuple[int, str]]]:
+    """Return current usage and the largest files whose removal reaches target_size
+    
+    Module-level so it can run in the CPU process pool.
+    """
+    # One stat pass: current total size and the candidates come from the same walk
+    files = [(entry.stat(follow_symlinks=False).st_size, entry.path) for entry in _walk_files(root)]
+    current_size = sum(size for size, _ in files)
+    excess = current_size - target_size
+    
+    # Pick the largest files, widening the heap until they cover the excess
+    victims = []
+    k = 64
+    while excess > 0:
+        victims = heapq.nlargest(k, files)
+        if len(victims) < k or sum(size for size, _ in victims) >= excess:
+            break
+        k *= 4
+    
+    return current_size, victims
+
 
 class StorageManager:
     """Manage storage to stay within resource limits"""
     
+    # Seconds a storage summary / artifacts size is reused so polling doesn't rewalk the tree
+    SUMMARY_CACHE_TTL = 30.0
+    # Artifact file stat results kept for repeated downloads
+    STAT_CACHE_SIZE = 4096
+    
     def __init__(self):
         self.storage_path = Path(settings.STORAGE_PATH)
         self.max_db_size = settings.MAX_DB_SIZE_MB * 1024 * 1024
         self.max_artifacts_size = settings.MAX_ARTIFACTS_SIZE_GB * 1024 * 1024 * 1024
         self.artifacts_path = self.storage_path / "artifacts"
         self.db_path = self.storage_path / "database" / "oapilot.db"
+        self._summary_cache: Optional[Tuple[float, Dict]] = None  # (monotonic time, summary)
+        self._artifacts_size_cache: Optional[Tuple[float, Dict]] = None  # (monotonic time, sizes)
+        self._stat_cache: "OrderedDict[str, Optional[os.stat_result]]" = OrderedDict()  # LRU, None = missing
     
     def check_database_size(self) -> Dict:
         """Monitor database size"""
@@ -42,34 +107,74 @@ class StorageManager:
         }
     
     def check_artifacts_size(self) -> Dict:
-        """Monitor artifacts storage"""
+        """Monitor artifacts storage (cached for SUMMARY_CACHE_TTL)"""
+        now = time.monotonic()
+        if self._artifacts_size_cache and now - self._artifacts_size_cache[0] < self.SUMMARY_CACHE_TTL:
+            return self._artifacts_size_cache[1]
+        
         total_size = 0
         file_count = 0
         
-        if self.artifacts_path.exists():
-            for f in self.artifacts_path.rglob("*"):
-                if f.is_file():
-                    total_size += f.stat().st_size
-                    file_count += 1
+        # Single scandir pass; file type comes from the directory entry
+        for entry in _walk_files(self.artifacts_path):
+            total_size += entry.stat(follow_symlinks=False).st_size
+            file_count += 1
         
-        return {
+        sizes = {
             "size_gb": round(total_size / (1024**3), 2),
             "limit_gb": self.max_artifacts_size / (1024**3),
             "usage_percent": round((total_size / self.max_artifacts_size) * 100, 2),
             "file_count": file_count,
             "path": str(self.artifacts_path)
         }
+        self._artifacts_size_cache = (now, sizes)
+        return sizes
     
     def get_storage_summary(self) -> Dict:
         """Get complete storage summary"""
-        return {
-            "database": self.check_database_size(),
-            "artifacts": self.check_artifacts_size(),
+        now = time.monotonic()
+        if self._summary_cache and now - self._summary_cache[0] < self.SUMMARY_CACHE_TTL:
+            return self._summary_cache[1]
+        
+        database = self.check_database_size()
+        artifacts = self.check_artifacts_size()
+        summary = {
+            "database": database,
+            "artifacts": artifacts,
             "total_usage_gb": round(
-                (self.check_database_size()["size_mb"] / 1024) +
-                self.check_artifacts_size()["size_gb"], 2
+                (database["size_mb"] / 1024) + artifacts["size_gb"], 2
             )
         }
+        self._summary_cache = (now, summary)
+        return summary
+    
+    def invalidate_summary(self):
+        """Drop the cached summary and artifacts size after storage changes"""
+        self._summary_cache = None
+        self._artifacts_size_cache = None
+    
+    def stat_artifact_file(self, file_path: str) -> Optional[os.stat_result]:
+        """stat() an artifact file, or None if missing; cached until the file changes"""
+        if file_path in self._stat_cache:
+            self._stat_cache.move_to_end(file_path)
+            return self._stat_cache[file_path]
+        
+        try:
+            result = os.stat(file_path)
+        except OSError:
+            result = None
+        
+        self._stat_cache[file_path] = result
+        if len(self._stat_cache) > self.STAT_CACHE_SIZE:
+            self._stat_cache.popitem(last=False)
+        return result
+    
+    def _invalidate_stat(self, file_path: Optional[str] = None):
+        """Forget one cached stat result, or all of them (bulk cleanups)"""
+        if file_path is None:
+            self._stat_cache.clear()
+        else:
+            self._stat_cache.pop(file_path, None)
     
     async def cleanup_old_sessions(self, days: int = None):
         """Remove old sessions and their data"""
@@ -77,39 +182,29 @@ class StorageManager:
         cutoff_date = datetime.now() - timedelta(days=days)
         
         try:
-            # Clean database
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            # Get sessions to delete
-            cursor.execute("""
-                SELECT session_id FROM chat_sessions 
-                WHERE created_at < ?
-            """, (cutoff_date.isoformat(),))
+            loop = asyncio.get_running_loop()
+            io_pool = get_io_pool()
             
-            old_sessions = [row[0] for row in cursor.fetchall()]
+            old_sessions = await loop.run_in_executor(
+                io_pool, self._delete_sessions_before, cutoff_date
+            )
             
             if old_sessions:
-                # Delete sessions (cascades to messages and artifacts)
-                placeholders = ",".join("?" * len(old_sessions))
-                cursor.execute(f"""
-                    DELETE FROM chat_sessions 
-                    WHERE session_id IN ({placeholders})
-                """, old_sessions)
-                
-                deleted_count = cursor.rowcount
-                conn.commit()
+                # Clean up artifact files by direct path under every type folder on disk
+                type_dirs = await loop.run_in_executor(io_pool, self._artifact_type_dirs)
+                session_dirs = [
+                    Path(type_dir) / session_id
+                    for type_dir in type_dirs
+                    for session_id in old_sessions
+                ]
+                await asyncio.gather(*(
+                    loop.run_in_executor(io_pool, self._remove_dir, path)
+                    for path in session_dirs
+                ))
                 
-                # Clean up artifact files
-                for session_id in old_sessions:
-                    session_artifacts_path = self.artifacts_path / "*" / session_id
-                    for path in self.storage_path.glob(str(session_artifacts_path)):
-                        if path.is_dir():
-                            shutil.rmtree(path)
-                
-                logger.info(f"Cleaned up {deleted_count} old sessions")
-            
-            conn.close()
+                logger.info(f"Cleaned up {len(old_sessions)} old sessions")
+                self.invalidate_summary()
+                self._invalidate_stat()
             
             # Vacuum database to reclaim space
             await vacuum_database()
@@ -117,31 +212,82 @@ class StorageManager:
         except Exception as e:
             logger.error(f"Error cleaning up old sessions: {e}")
     
+    def _delete_sessions_before(self, cutoff_date: datetime) -> Set[str]:
+        """Delete expired sessions and return their IDs (blocking)"""
+        # Manual transaction control: one explicit BEGIN IMMEDIATE ... COMMIT
+        conn = sqlite3.connect(str(self.db_path), isolation_level=None, timeout=15)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            
+            # Take the write lock up front so the delete never has to upgrade a read lock
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Delete sessions (cascades to messages and artifacts) and collect their IDs
+                rows = conn.execute(_DELETE_EXPIRED_SESSIONS, (cutoff_date.isoformat(),)).fetchall()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            
+            # IDs are stored as 16-byte UUID blobs
+            return {
+                str(uuid.UUID(bytes=row[0])) if isinstance(row[0], bytes) else row[0]
+                for row in rows
+            }
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def _remove_dir(path: Path):
+        """Remove a session artifact directory if present (blocking)"""
+        if path.is_dir():
+            shutil.rmtree(path)
+    
     async def cleanup_old_artifacts(self, days: int = None):
         """Remove old artifact files"""
         days = days or settings.ARTIFACT_RETENTION_DAYS
         cutoff_date = datetime.now() - timedelta(days=days)
         cutoff_timestamp = cutoff_date.timestamp()
         
-        removed_count = 0
-        removed_size = 0
-        
         try:
-            for artifact_type in ["code", "documents", "diagrams", "exports"]:
-                type_path = self.artifacts_path / artifact_type
-                if type_path.exists():
-                    for file_path in type_path.rglob("*"):
-                        if file_path.is_file():
-                            if file_path.stat().st_mtime < cutoff_timestamp:
-                                removed_size += file_path.stat().st_size
-                                file_path.unlink()
-                                removed_count += 1
+            loop = asyncio.get_running_loop()
+            removed_count, removed_size = await loop.run_in_executor(
+                get_io_pool(), self._remove_files_older_than, cutoff_timestamp
+            )
             
             logger.info(f"Removed {removed_count} old artifacts ({removed_size / (1024*1024):.1f} MB)")
+            if removed_count:
+                self.invalidate_summary()
+                self._invalidate_stat()
             
         except Exception as e:
             logger.error(f"Error cleaning up old artifacts: {e}")
     
+    def _artifact_type_dirs(self) -> List[str]:
+        """Artifact type folders that exist on disk (uploads may use any type name)"""
+        try:
+            with os.scandir(self.artifacts_path) as entries:
+                return [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            return []
+    
+    def _remove_files_older_than(self, cutoff_timestamp: float) -> Tuple[int, int]:
+        """Unlink artifact files last modified before cutoff_timestamp (blocking)"""
+        removed_count = 0
+        removed_size = 0
+        
+        for type_dir in self._artifact_type_dirs():
+            for entry in _walk_files(type_dir):
+                stat = entry.stat(follow_symlinks=False)
+                if stat.st_mtime < cutoff_timestamp:
+                    os.unlink(entry.path)
+                    removed_size += stat.st_size
+                    removed_count += 1
+        
+        return removed_count, removed_size
+    
     async def enforce_storage_limits(self):
         """Enforce storage limits by removing oldest data"""
         
@@ -162,36 +308,38 @@ class StorageManager:
         target_usage = 60  # Target 60% usage
         target_size = self.max_artifacts_size * (target_usage / 100)
         
-        # Get all artifact files with info
-        files = []
-        for f in self.artifacts_path.rglob("*"):
-            if f.is_file():
-                files.append({
-                    "path": f,
-                    "size": f.stat().st_size,
-                    "mtime": f.stat().st_mtime
-                })
+        loop = asyncio.get_running_loop()
         
-        # Sort by size (largest first)
-        files.sort(key=lambda x: x["size"], reverse=True)
+        # Walk and rank files in the CPU pool; only the selected victims come back
+        current_size, victims = await loop.run_in_executor(
+            get_cpu_pool(), _select_largest_files, str(self.artifacts_path), target_size
+        )
         
-        # Calculate current total size
-        current_size = sum(f["size"] for f in files)
+        removed_count = await loop.run_in_executor(
+            get_io_pool(), self._unlink_until, victims, current_size, target_size
+        )
         
-        # Remove files until under target
+        logger.info(f"Removed {removed_count} large artifacts to free space")
+        if removed_count:
+            self.invalidate_summary()
+            self._invalidate_stat()
+    
+    @staticmethod
+    def _unlink_until(victims: List[Tuple[int, str]], current_size: int, target_size: float) -> int:
+        """Remove files in order until usage drops to target_size (blocking)"""
         removed_count = 0
-        for file_info in files:
+        for size, path in victims:
             if current_size <= target_size:
                 break
             
             try:
-                file_info["path"].unlink()
-                current_size -= file_info["size"]
+                os.unlink(path)
+                current_size -= size
                 removed_count += 1
             except Exception as e:
-                logger.error(f"Failed to remove {file_info['path']}: {e}")
+                logger.error(f"Failed to remove {path}: {e}")
         
-        logger.info(f"Removed {removed_count} large artifacts to free space")
+        return removed_count
     
     def get_artifact_path(
         self,
@@ -202,7 +350,7 @@ class StorageManager:
         """Get the full path for an artifact"""
         return self.artifacts_path / artifact_type / session_id / filename
     
-    def save_artifact_file(
+    async def save_artifact_file(
         self,
         content: str,
         artifact_type: str,
@@ -211,15 +359,17 @@ class StorageManager:
     ) -> Dict:
         """Save an artifact file to storage"""
         file_path = self.get_artifact_path(artifact_type, session_id, filename)
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+        await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
         
         try:
-            # Write content
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # Write content off the event loop
+            async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
+                await f.write(content)
             
             # Get file info
-            stat = file_path.stat()
+            stat = await aiofiles.os.stat(file_path)
+            self.invalidate_summary()
+            self._invalidate_stat(str(file_path))
             
             return {
                 "path": str(file_path),
@@ -231,29 +381,84 @@ class StorageManager:
             logger.error(f"Failed to save artifact {filename}: {e}")
             raise
     
-    def read_artifact_file(self, file_path: str) -> Optional[str]:
-        """Read an artifact file"""
-        path = Path(file_path)
+    async def save_artifact_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        artifact_type: str,
+        session_id: str,
+        filename: str
+    ) -> Dict:
+        """Stream raw bytes into an artifact file without buffering the whole payload"""
+        file_path = self.get_artifact_path(artifact_type, session_id, filename)
+        await aiofiles.os.makedirs(file_path.parent, exist_ok=True)
         
-        if not path.exists():
-            return None
+        # Write to a temp file and rename, so readers never see a partial upload
+        tmp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex}.part")
+        size = 0
         
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                return f.read()
+            async with aiofiles.open(tmp_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                    size += len(chunk)
+                await f.flush()
+                await asyncio.get_running_loop().run_in_executor(get_io_pool(), os.fsync, f.fileno())
+            await aiofiles.os.replace(tmp_path, file_path)
+            
+            stat = await aiofiles.os.stat(file_path)
+            self.invalidate_summary()
+            self._invalidate_stat(str(file_path))
+            
+            return {
+                "path": str(file_path),
+                "size_bytes": size,
+                "created": datetime.fromtimestamp(stat.st_mtime)
+            }
+            
+        except Exception as e:
+            logger.error(f"Failed to save artifact {filename}: {e}")
+            try:
+                await aiofiles.os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    
+    async def read_artifact_file(self, file_path: str) -> Optional[str]:
+        """Read an artifact file as text
+        
+        Raises UnicodeDecodeError for binary files, so callers can tell them
+        apart from missing ones.
+        """
+        path = Path(file_path)
+        
+        try:
+            async with aiofiles.open(path, "r", encoding="utf-8") as f:
+                return await f.read()
+        except FileNotFoundError:
+            return None
+        except UnicodeDecodeError:
+            raise
         except Exception as e:
             logger.error(f"Failed to read artifact {file_path}: {e}")
             return None
     
+    async def stream_artifact_file(self, file_path: str, chunk_size: int = 65536) -> AsyncIterator[bytes]:
+        """Yield an artifact file's raw bytes in chunk_size pieces"""
+        async with aiofiles.open(file_path, "rb") as f:
+            while chunk := await f.read(chunk_size):
+                yield chunk
+    
     def delete_artifact_file(self, file_path: str) -> bool:
         """Delete an artifact file"""
         path = Path(file_path)
+        self._invalidate_stat(file_path)
         
         if not path.exists():
             return False
         
         try:
             path.unlink()
+            self.invalidate_summary()
             return True
         except Exception as e:
             logger.error(f"Failed to delete artifact {file_path}: {e}")
@@ -4,12 +4,48 @@ Simple MCP Server for testing
 Implements basic JSON-RPC MCP protocol over STDIO
 """
 import json
+import os
 import sys
 import logging
 
-# Setup basic logging to stderr so it doesn't interfere with stdout
+# orjson parses/serializes JSON-RPC messages much faster; fall back to the
+# stdlib where no wheel is installed. Both accept bytes and produce bytes here.
+try:
+    import orjson
+
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode('utf-8')
+
+# Sent for any line that is not valid JSON
+PARSE_ERROR_RESPONSE = _dumps({
+    "jsonrpc": "2.0",
+    "id": None,
+    "error": {
+        "code": -32700,
+        "message": "Parse error"
+    }
+})
+
+# Sent for JSON that is not a request object
+INVALID_REQUEST_RESPONSE = _dumps({
+    "jsonrpc": "2.0",
+    "id": None,
+    "error": {
+        "code": -32600,
+        "message": "Invalid Request"
+    }
+})
+
+# Setup basic logging to stderr so it doesn't interfere with stdout.
+# Per-message log calls use %-style arguments, so payload reprs are only built
+# when the level (SIMPLE_MCP_LOG_LEVEL, default DEBUG) lets the record through
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.environ.get("SIMPLE_MCP_LOG_LEVEL", "DEBUG").upper(),
     format='%(asctime)s - %(levelname)s - %(message)s',
     stream=sys.stderr
 )
@@ -20,9 +56,14 @@ class SimpleMCPServer:
         self.name = "simple-mcp-server"
         self.version = "1.0.0"
 
+        # Results that never change, serialized once and spliced into responses
+        self._constant_results = {
+            method: _dumps(self._DISPATCH[method](self, {}))
+            for method in ("initialize", "tools/list", "resources/list")
+        }
+
     def handle_initialize(self, params):
         """Handle MCP initialize request"""
-        logger.info(f"Initialize request: {params}")
         return {
             "protocolVersion": "2024-11-05",
             "capabilities": {
@@ -42,7 +83,6 @@ class SimpleMCPServer:
 
     def handle_tools_list(self, params):
         """Handle tools/list request"""
-        logger.info("Tools list request")
         return {
             "tools": [
                 {
@@ -67,7 +107,7 @@ class SimpleMCPServer:
         tool_name = params.get("name")
         arguments = params.get("arguments", {})
 
-        logger.info(f"Tool call: {tool_name} with args: {arguments}")
+        logger.info("Tool call: %s with args: %s", tool_name, arguments)
 
         if tool_name == "echo":
             text = arguments.get("text", "No text provided")
@@ -84,7 +124,6 @@ class SimpleMCPServer:
 
     def handle_resources_list(self, params):
         """Handle resources/list request"""
-        logger.info("Resources list request")
         return {
             "resources": [
                 {
@@ -96,6 +135,14 @@ class SimpleMCPServer:
             ]
         }
 
+    # JSON-RPC method -> handler
+    _DISPATCH = {
+        "initialize": handle_initialize,
+        "tools/list": handle_tools_list,
+        "tools/call": handle_tools_call,
+        "resources/list": handle_resources_list,
+    }
+
     def handle_request(self, request):
         """Handle incoming JSON-RPC request"""
         try:
@@ -103,19 +150,13 @@ class SimpleMCPServer:
             params = request.get("params", {})
             request_id = request.get("id")
 
-            logger.info(f"Handling method: {method}")
+            logger.info("Handling method: %s", method)
 
             # Route to appropriate handler
-            if method == "initialize":
-                result = self.handle_initialize(params)
-            elif method == "tools/list":
-                result = self.handle_tools_list(params)
-            elif method == "tools/call":
-                result = self.handle_tools_call(params)
-            elif method == "resources/list":
-                result = self.handle_resources_list(params)
-            else:
+            handler = self._DISPATCH.get(method)
+            if handler is None:
                 raise ValueError(f"Unknown method: {method}")
+            result = handler(self, params)
 
             # Return success response
             response = {
@@ -138,42 +179,81 @@ class SimpleMCPServer:
 
         return response
 
+    def handle_line(self, line):
+        """Handle one JSON-RPC message line; returns the response line, or None"""
+        line = line.strip()
+        if not line:
+            return None
+
+        try:
+            # Parse JSON-RPC request
+            request = _loads(line)
+        except json.JSONDecodeError as e:
+            logger.error(f"Invalid JSON: {e}")
+            return PARSE_ERROR_RESPONSE + b'\n'
+        logger.info("Received request: %s", request)
+        if not isinstance(request, dict):
+            return INVALID_REQUEST_RESPONSE + b'\n'
+
+        # Errors are answered on this line so replies to the rest of the read still go out
+        try:
+            # Constant results skip handle_request and re-serialization
+            method = request.get("method")
+            result = self._constant_results.get(method)
+            if result is not None and "id" in request:
+                logger.info("Sent cached %s response", method)
+                return b'{"jsonrpc":"2.0","id":' + _dumps(request["id"]) + b',"result":' + result + b'}\n'
+
+            # Handle request
+            response = self.handle_request(request)
+            logger.info("Sent response: %s", response)
+            return _dumps(response) + b'\n'
+        except Exception as e:
+            logger.error(f"Error handling line: {e}")
+            return _dumps({
+                "jsonrpc": "2.0",
+                "id": None,
+                "error": {
+                    "code": -32603,
+                    "message": str(e)
+                }
+            }) + b'\n'
+
     def run(self):
         """Main server loop - read from stdin, write to stdout"""
         logger.info("Starting Simple MCP Server")
 
+        # Read whatever the pipe holds in one syscall and split lines ourselves;
+        # responses to one read are written and flushed together
+        read = sys.stdin.buffer.raw.read
+        stdout = sys.stdout.buffer
+        buf = bytearray()
+
         try:
-            # Process requests line by line
-            for line in sys.stdin:
-                line = line.strip()
-                if not line:
-                    continue
-
-                try:
-                    # Parse JSON-RPC request
-                    request = json.loads(line)
-                    logger.info(f"Received request: {request}")
-
-                    # Handle request
-                    response = self.handle_request(request)
-
-                    # Send response
-                    response_json = json.dumps(response)
-                    print(response_json, flush=True)
-                    logger.info(f"Sent response: {response}")
-
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON: {e}")
-                    # Send error response
-                    error_response = {
-                        "jsonrpc": "2.0",
-                        "id": None,
-                        "error": {
-                            "code": -32700,
-                            "message": "Parse error"
-                        }
-                    }
-                    print(json.dumps(error_response), flush=True)
+            while True:
+                chunk = read(65536)
+                if not chunk:
+                    break
+                buf.extend(chunk)
+
+                out = bytearray()
+                start = 0
+                while (end := buf.find(b'\n', start)) != -1:
+                    response = self.handle_line(bytes(buf[start:end]))
+                    if response:
+                        out.extend(response)
+                    start = end + 1
+                del buf[:start]
+
+                if out:
+                    stdout.write(out)
+                    stdout.flush()
+
+            # A final message without a trailing newline
+            response = self.handle_line(bytes(buf))
+            if response:
+                stdout.write(response)
+                stdout.flush()
 
         except KeyboardInterrupt:
             logger.info("Server stopped by user")